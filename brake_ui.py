@@ -11,11 +11,12 @@ import signal
 from PyQt5 import QtWidgets, QtCore
 from PyQt5.QtWidgets import ( QApplication, QDialog, QMainWindow, QMessageBox )
 from PyQt5.QtWidgets import QGraphicsScene, QGraphicsView, QGraphicsEllipseItem, QGraphicsRectItem, QGraphicsLineItem, QGraphicsTextItem
-from PyQt5.QtCore import Qt, QUrl, QRect
-from PyQt5.QtGui import QBrush, QPen, QFont, QPixmap, QPainter
+from PyQt5.QtCore import Qt, QUrl, QRect, QRectF, QPointF
+from PyQt5.QtGui import QBrush, QPen, QFont, QPixmap, QPainter, QTransform
 
 import state
 import sound
+import pixmap_cache
 
 # Define the sizes needed to draw the gauge.
 # The gauge canvas is twice the gauge size for text and other 
@@ -30,6 +31,7 @@ TICK_MARGIN = 10        # Margin for the ticks
 ARROW_MARGIN = 30       # Margin for ends of the arrow
 ARROW_X_OFFSET=12       # Shift arrow right
 ARROW_X_CENTER=39       # Distance between point of arrow and center
+FACE_MARGIN = 2         # Room around the face pixmap for the circle's pen
 #
 # Angles on the gauge
 #
@@ -55,9 +57,17 @@ APPLY_DROP=5.0/TICK     # We drop at the rate of 5 LBS/second when APPLY
 # Apply tuning
 MAX_EXTEND=1.0          # It takes one second to extend
 EXTEND_RATE=MAX_EXTEND/TICK     # How much to move when extending
+
+# The air sound each valve position makes while the air is moving
+VALVE_SOUNDS = {
+    state.BrakeEnum.APPLY: sound.SoundEnum.APPLY,
+    state.BrakeEnum.RELEASE: sound.SoundEnum.RELEASE
+}
 # We brake at the rate of 1.0 (video speed) per second per 10 pounds of pressure
 # So with a pressure of 10 we go from 1.0 to 0 in 1 second
 # So with a pressure of 20 we go from 1.0 to 0 in 2 seconds
+ACCEL_PER_PSI = -0.025 / TICK   # Brake acceleration per PSI (see below)
+
 def ComputeBrakeAcceleration(RedPressure):
     """ 
     Return the acceleration caused by brakes
@@ -73,9 +83,14 @@ def ComputeBrakeAcceleration(RedPressure):
     # -1/10 = acceleration with 20 LB set
 
     # 10 LB set, slows at the rate of 0.025 speed
-    Acceleration = (-((0.025 * RedPressure) / TICK))
-    state.Log("BrakeAcceleration %3.2f RedPressure %d" % (Acceleration, RedPressure))
-    return(Acceleration)
+    # Pure arithmetic, no logging.  The callers log the result.
+    return (ACCEL_PER_PSI * RedPressure)
+
+# Emergency always brakes with the full pipe pressure
+EMERGENCY_ACCEL = ComputeBrakeAcceleration(MAX_BRAKE_PRESSURE)
+
+# Angle of the arrow for each whole PSI on the gauge
+ANGLE_LUT = tuple(Pressure*2 + START_ANGLE for Pressure in range(MAX_PRESSURE+1))
 
 def PressureToAngle(Pressure):
      """
@@ -85,35 +100,51 @@ def PressureToAngle(Pressure):
 
      :returns: Angle on the gauge
      """
-     return (Pressure*2 + START_ANGLE)
-
-
-def CreateTick(Angle):
+     Index = int(Pressure + 0.5)
+     if (Index < 0):
+         Index = 0
+     elif (Index > MAX_PRESSURE):
+         Index = MAX_PRESSURE
+     return (ANGLE_LUT[Index])
+
+
+# Angles of the tick marks (one every 10 PSI)
+TICK_ANGLES = range(START_ANGLE, STOP_ANGLE, 20)
+# Labels on the gauge: (Angle, Pressure, XAdjust, YAdjust)
+TICK_LABELS = (
+    (-10,  10,  0,  0),
+    ( 30,  30,  3, -2),
+    ( 70,  50,  8, -5),
+    (110,  70, 10, -5),
+    (150,  90, 15, -5),
+    (190, 110, 20,  0))
+
+def TickEndpoints(Angles):
     """
-    Create a tick line at the given angle.
+    Compute the end points of all the tick lines in one pass
 
-    :param Angle: Angle in degrees for the tick
+    :param Angles: Angles in degrees for the ticks
 
-    :returns: The tick line object
+    :returns: Dictionary of Angle -> (x0, y0, x1, y1)
     """
-    XCenter = GAUGE_SIZE / 2
-    YCenter = GAUGE_SIZE / 2
-
-    x0 = TICK_MARGIN
-    y0 = GAUGE_SIZE/2
-    x1 = TICK_MARGIN + TICK_SIZE
-    y1 = GAUGE_SIZE / 2
-    (x0, y0) = rotate_point((x0,y0), Angle, (XCenter, YCenter))
-    (x1, y1) = rotate_point((x1,y1), Angle, (XCenter, YCenter))
-
-    TickLine = QGraphicsLineItem(x0, y0, x1, y1)
-    return(TickLine)
-
-def TickNumber(Angle, Pressure, XAdjust, YAdjust):
+    Center = GAUGE_SIZE / 2
+    # The unrotated tick lies on the horizontal center line so only
+    # the X distance from the center gets rotated
+    Inner = TICK_MARGIN - Center
+    Outer = TICK_MARGIN + TICK_SIZE - Center
+
+    Result = {}
+    for Angle in Angles:
+        (CosA, SinA) = angle_cos_sin(Angle)
+        Result[Angle] = (Center + Inner * CosA, Center + Inner * SinA,
+                         Center + Outer * CosA, Center + Outer * SinA)
+    return (Result)
+
+def TickNumber(Point, Pressure, XAdjust, YAdjust):
     """
     Create text with a tick number in it
 
-    :param Angle: Angle at which to place the number
+    :param Point: Outer end of the tick at which to place the number
     :param Pressure: Pressure to display
     :param XAdjust: Adjust X direction
     :param YAdjust: Adjust Y direction
@@ -126,33 +157,147 @@ def TickNumber(Angle, Pressure, XAdjust, YAdjust):
     Text = QGraphicsTextItem("%d" % Pressure)
     Text.setFont(Font)
 
-    RotatePoint = rotate_point((TICK_MARGIN + TICK_SIZE, GAUGE_SIZE/2), Angle, (GAUGE_SIZE/2, GAUGE_SIZE/2))
-
-    Text.setPos(RotatePoint[0] - XAdjust, RotatePoint[1] - Text.boundingRect().height()/2 - YAdjust)
+    Text.setPos(Point[0] - XAdjust, Point[1] - Text.boundingRect().height()/2 - YAdjust)
     return(Text)
 
-#https://stackoverflow.com/questions/20023209/function-for-rotating-2d-objects
-def rotate_point(point, angle, center_point=(0, 0)):
-    """Rotates a point around center_point(origin by default)
-    Angle is in degrees.
-    Rotation is counter-clockwise
+COS_SIN_CACHE = {}      # Angle (degrees) -> (cos, sin)
+
+def angle_cos_sin(angle):
+    """Return the cosine and sine of an angle.
+
+    The ticks use the same handful of angles so the results
+    are cached.
+
+    :param angle: Angle in degrees
 
-    :param point: Point we are rotating
-    :param angle: Angle of rotation in degrees
-    :param center_point: Point around which we rotate
+    :returns: (cos, sin) of the angle
+    """
+    angle = angle % 360
+    cos_sin = COS_SIN_CACHE.get(angle)
+    if cos_sin is None:
+        angle_rad = math.radians(angle)
+        cos_sin = (math.cos(angle_rad), math.sin(angle_rad))
+        COS_SIN_CACHE[angle] = cos_sin
+    return cos_sin
+
+def GaugeFace():
+    """
+    Draw the parts of the gauge that never move (circle, ticks and
+    numbers) into a pixmap.
+
+    :returns: Pixmap of the face.  Its top left corner goes at
+        (-FACE_MARGIN, -FACE_MARGIN) in the gauge scene.
+    """
+    Face = QGraphicsScene(-FACE_MARGIN, -FACE_MARGIN,
+        DRAW_X_SIZE + 2*FACE_MARGIN, DRAW_Y_SIZE + 2*FACE_MARGIN)
+    # Not a typo.  We want the circle centered at the top of the Scene
+    Ellipse = QGraphicsEllipseItem(0, 0, GAUGE_SIZE, GAUGE_SIZE)
+
+    Pen = QPen(Qt.black)
+    Pen.setWidth(3)
+    Ellipse.setPen(Pen)
+    Face.addItem(Ellipse)
+
+    # __debug__ lets "python -O" drop this block entirely
+    if __debug__ and DEBUG:
+        DebugRect = QGraphicsRectItem(0,0,DRAW_X_SIZE, DRAW_Y_SIZE)
+        DebugPen = QPen(Qt.red)
+        DebugPen.setWidth(3)
+        DebugRect.setPen(DebugPen)
+
+        # Add the items to the scene. Items are stacked in the order they are added.
+        Face.addItem(DebugRect)
+        DebugLine = QGraphicsLineItem(0, GAUGE_SIZE/2, DRAW_X_SIZE, GAUGE_SIZE/2)
+        DebugLine.setPen(DebugPen)
+        Face.addItem(DebugLine)
+
+        # Line up/down
+        DebugLine = QGraphicsLineItem(GAUGE_SIZE/2, 0, GAUGE_SIZE/2, DRAW_Y_SIZE)
+        DebugLine.setPen(DebugPen)
+        Face.addItem(DebugLine)
+
+    TickPen = QPen(Qt.black)
+    TickPen.setWidth(2)
+
+    Ticks = TickEndpoints(TICK_ANGLES)
+    for (x0, y0, x1, y1) in Ticks.values():
+        TickLine = QGraphicsLineItem(x0, y0, x1, y1)
+        TickLine.setPen(TickPen)
+        Face.addItem(TickLine)
+
+    # The numbers go at the outer end of their tick
+    for (Angle, Pressure, XAdjust, YAdjust) in TICK_LABELS:
+        Text = TickNumber(Ticks[Angle][2:], Pressure, XAdjust, YAdjust)
+        Face.addItem(Text)
+
+    Pixmap = QPixmap(DRAW_X_SIZE + 2*FACE_MARGIN, DRAW_Y_SIZE + 2*FACE_MARGIN)
+    Pixmap.fill(Qt.transparent)
+    Painter = QPainter(Pixmap)
+    # Same hints as a QGraphicsView so it looks like it did as items
+    Painter.setRenderHint(QPainter.TextAntialiasing)
+    Face.render(Painter, QRectF(Pixmap.rect()), Face.sceneRect())
+    Painter.end()
+    return (Pixmap)
+
+class RotatedPixmaps():
+    """
+    A pixmap rotated to every whole degree around a fixed origin.
 
-    :returns: Rotated point
+    Swapping in a pixmap that is already rotated is cheaper than having
+    Qt transform the item every time it paints.  Each angle is rotated
+    the first time it is needed.
     """
-    angle_rad = math.radians(angle % 360)
-    # Shift the point so that center_point becomes the origin
-    new_point = (point[0] - center_point[0], point[1] - center_point[1])
-    new_point = (new_point[0] * math.cos(angle_rad) - new_point[1] * math.sin(angle_rad),
-                 new_point[0] * math.sin(angle_rad) + new_point[1] * math.cos(angle_rad))
-    # Reverse the shifting we have done
-    new_point = (new_point[0] + center_point[0], new_point[1] + center_point[1])
-    return new_point
+    __slots__ = ('Pixmap', 'Origin', 'Rotated')
+
+    def __init__(self, Pixmap, OriginX, OriginY):
+        """
+        :param Pixmap: The unrotated pixmap
+        :param OriginX: X of the point to rotate around (pixmap coordinates)
+        :param OriginY: Y of the point to rotate around (pixmap coordinates)
+        """
+        self.Pixmap = Pixmap
+        self.Origin = QPointF(OriginX, OriginY)
+        self.Rotated = {}       # Angle -> (Pixmap, Offset)
+
+    def Get(self, Angle):
+        """
+        Get the pixmap for an angle
+
+        :param Angle: Angle in degrees (whole number)
+
+        :returns: (Pixmap, Offset) where offset is where the pixmap's top
+            left corner goes so the origin does not move
+        """
+        Angle = Angle % 360
+        Result = self.Rotated.get(Angle)
+        if (Result is None):
+            Transform = QTransform().rotate(Angle)
+            Rotated = self.Pixmap.transformed(Transform, Qt.SmoothTransformation)
+            # transformed() moves the result so it starts at 0,0.
+            # Find out where the origin went.
+            Matrix = QPixmap.trueMatrix(Transform, self.Pixmap.width(), self.Pixmap.height())
+            Result = (Rotated, self.Origin - Matrix.map(self.Origin))
+            self.Rotated[Angle] = Result
+        return (Result)
+
+    def Show(self, Item, Angle):
+        """
+        Show the pixmap on a QGraphicsPixmapItem at the given angle
+
+        :param Item: The item to update
+        :param Angle: Angle in degrees (whole number)
+        """
+        (Pixmap, Offset) = self.Get(Angle)
+        Item.setPixmap(Pixmap)
+        Item.setOffset(Offset)
 
 class BrakeUi():
+    # Fixed set of attributes, no per instance dictionary
+    __slots__ = ('Scene', 'RedItem', 'BlackItem', 'RedArrows', 'BlackArrows',
+                 'RedRotation', 'BlackRotation', 'BrakeList', 'CheckedBrake',
+                 'Pumping', 'PumpAllowed', 'BrakeDispatch',
+                 'BlackPressure', 'RedPressure', 'Extend')
+
     def __init__(self, MainWindow):
         """
         Setup brake gauge
@@ -164,68 +309,35 @@ class BrakeUi():
         # Setup the brake gauge
         #-----------------------------------------------------------
         self.Scene = QGraphicsScene(0, 0, DRAW_X_SIZE, DRAW_Y_SIZE)
-        # Not a typo.  We want the circle centered at the top of the Scene
-        Ellipse = QGraphicsEllipseItem(0, 0, GAUGE_SIZE, GAUGE_SIZE)
-
-        Pen = QPen(Qt.black)
-        Pen.setWidth(3)
-        Ellipse.setPen(Pen)
-        self.Scene.addItem(Ellipse)
-
-        if DEBUG:
-            DebugRect = QGraphicsRectItem(0,0,DRAW_X_SIZE, DRAW_Y_SIZE)
-            DebugPen = QPen(Qt.red)
-            DebugPen.setWidth(3)
-            DebugRect.setPen(DebugPen)
-
-            # Add the items to the scene. Items are stacked in the order they are added.
-            self.Scene.addItem(DebugRect)
-            DebugLine = QGraphicsLineItem(0, GAUGE_SIZE/2, DRAW_X_SIZE, GAUGE_SIZE/2)
-            DebugLine.setPen(DebugPen)
-            self.Scene.addItem(DebugLine)
-
-            # Line up/down
-            DebugLine = QGraphicsLineItem(GAUGE_SIZE/2, 0, GAUGE_SIZE/2, DRAW_Y_SIZE)
-            DebugLine.setPen(DebugPen)
-            self.Scene.addItem(DebugLine)
-
-        TickPen = QPen(Qt.black)
-        TickPen.setWidth(2)
-
-        DebugPressure = 0
-        for Angle in range(-30, 220, 20):
-            DebugPressure += 10
-            TickLine = CreateTick(Angle)
-            TickLine.setPen(TickPen)
-            self.Scene.addItem(TickLine)
-
-        Text = TickNumber(-10, 10, 0, 0)
-        self.Scene.addItem(Text)
-        Text = TickNumber( 30, 30, 3, -2)
-        self.Scene.addItem(Text)
-        Text = TickNumber( 70, 50, 8, -5)
-        self.Scene.addItem(Text)
-        Text = TickNumber( 110, 70, 10, -5) 
-        self.Scene.addItem(Text)
-        Text = TickNumber( 150, 90, 15, -5) 
-        self.Scene.addItem(Text)
-        Text = TickNumber( 190, 110, 20, 0) 
-        self.Scene.addItem(Text)
-
-        RawRedArrow = QPixmap(os.path.join("image", "arrow-ed.png"))
-        RedArrow = RawRedArrow.scaledToWidth(DRAW_X_SIZE - ARROW_MARGIN)
+        # The face never changes so it is one pixmap.  Only the
+        # arrows are live items in the scene.
+        FaceItem = self.Scene.addPixmap(GaugeFace())
+        FaceItem.setPos(-FACE_MARGIN, -FACE_MARGIN)
+
+        RedArrow = pixmap_cache.LoadPixmap("arrow-ed.png", Width=DRAW_X_SIZE - ARROW_MARGIN)
         self.RedItem = self.Scene.addPixmap(RedArrow)
         self.RedItem.setPos(ARROW_X_OFFSET, DRAW_Y_SIZE/2 - RedArrow.height()/2)
-        self.RedItem.setTransformOriginPoint(ARROW_X_CENTER, RedArrow.height()/2)
-        self.RedItem.setRotation(0)
+        self.RedArrows = RotatedPixmaps(RedArrow, ARROW_X_CENTER, RedArrow.height()/2)
 
-        RawBlackArrow = QPixmap(os.path.join("image", "arrow-black.png"))
-        BlackArrow = RawBlackArrow.scaledToWidth(DRAW_X_SIZE - ARROW_MARGIN)
+        BlackArrow = pixmap_cache.LoadPixmap("arrow-black.png", Width=DRAW_X_SIZE - ARROW_MARGIN)
         self.BlackItem = self.Scene.addPixmap(BlackArrow)
         self.BlackItem.setPos(ARROW_X_OFFSET, DRAW_Y_SIZE/2 - BlackArrow.height()/2)
-        self.BlackItem.setTransformOriginPoint(ARROW_X_CENTER, BlackArrow.height()/2)
-        self.BlackItem.setRotation(0)
+        self.BlackArrows = RotatedPixmaps(BlackArrow, ARROW_X_CENTER, BlackArrow.height()/2)
+
+        # Current arrow angles.  We only swap pixmaps when the angle
+        # really changes.
+        self.RedRotation = 0
+        self.BlackRotation = 0
         self.BrakeList = [MainWindow.BrakeApply, MainWindow.BrakeRelease, MainWindow.BrakeLap, MainWindow.BrakeEmergency]
+        self.CheckedBrake = None        # Index of the checked brake button
+        self.Pumping = False
+        # What to do each tick for each valve position
+        self.BrakeDispatch = {
+            state.BrakeEnum.APPLY: self.UpdateApply,
+            state.BrakeEnum.RELEASE: self.UpdateRelease,
+            state.BrakeEnum.LAP: self.UpdateLap,
+            state.BrakeEnum.EMERGENCY: self.UpdateEmergency
+        }
         self.BrakeReset()
 
     def PumpStop(self):
@@ -243,6 +355,9 @@ class BrakeUi():
 
         Turns on and off the pumping sound
         """
+        # PumpCheck calls us every tick, so only act on a change
+        if (NewPumping == self.Pumping):
+            return
         self.Pumping = NewPumping
         if (self.Pumping):
             sound.PlaySound.Play(sound.SoundEnum.PUMP_UP, True)
@@ -258,15 +373,17 @@ class BrakeUi():
         if (not self.PumpAllowed):
             return
 
-        if (self.BlackPressure <= PUMP_UP_START):
+        BlackPressure = self.BlackPressure
+        if (BlackPressure <= PUMP_UP_START):
             self.SetPumping(True)
 
-        if (self.BlackPressure <= MAX_BRAKE_PRESSURE):
-            self.BlackPressure += PUMP_UP_RATE
+        if (BlackPressure <= MAX_BRAKE_PRESSURE):
+            BlackPressure += PUMP_UP_RATE
 
-        if (self.BlackPressure >= MAX_BRAKE_PRESSURE):
-            self.BlackPressure = MAX_BRAKE_PRESSURE
+        if (BlackPressure >= MAX_BRAKE_PRESSURE):
+            BlackPressure = MAX_BRAKE_PRESSURE
             self.PumpStop()
+        self.BlackPressure = BlackPressure
 
     def SetGauge(self):
         """
@@ -276,8 +393,12 @@ class BrakeUi():
         BlackRotation = PressureToAngle(self.BlackPressure)
         if (RedRotation == BlackRotation):
             BlackRotation += 3
-        self.RedItem.setRotation(RedRotation)
-        self.BlackItem.setRotation(BlackRotation)
+        if (RedRotation != self.RedRotation):
+            self.RedArrows.Show(self.RedItem, RedRotation)
+            self.RedRotation = RedRotation
+        if (BlackRotation != self.BlackRotation):
+            self.BlackArrows.Show(self.BlackItem, BlackRotation)
+            self.BlackRotation = BlackRotation
 
     def BrakeApplyClicked(self): 
         """
@@ -301,10 +422,21 @@ class BrakeUi():
         """
         The Brake:Emergency button clicked
         """
+        self.SetBrake(state.BrakeEnum.EMERGENCY)
+
+    def ApplyEmergency(self):
+        """
+        Called once when the valve goes into emergency.
+
+        All the air is dumped, the pump stops, and the emergency valve
+        sounds.  UpdateEmergency only has to keep the brakes on after that.
+        """
         self.BlackPressure = 0
         self.RedPressure = 0
+        self.PumpStop()
+        state.State.BrakeAcceleration = EMERGENCY_ACCEL
+        sound.PlaySound.Play(sound.SoundEnum.EMERGENCY, False)
         self.SetGauge()
-        self.SetBrake(state.BrakeEnum.EMERGENCY)
 
     def BrakeReset(self):
         """
@@ -317,7 +449,7 @@ class BrakeUi():
         self.SetPumping(False)
         self.Extend = 0
         state.State.BrakeAcceleration = 0
-        state.Log("BrakeAcceleration %f" % state.State.BrakeAcceleration)
+        state.Log("BrakeAcceleration %f", 0)
         self.SetGauge()
 
     def SetBrake(self, What):
@@ -326,15 +458,32 @@ class BrakeUi():
 
         :param What: Valve position
         """
+        OldPosition = state.State.BrakeValvePosition
         state.State.BrakeValvePosition = What
-        # Emergency sound here.  All others in the update function
-        if (What == state.BrakeEnum.EMERGENCY):
-            sound.PlaySound.Play(sound.SoundEnum.EMERGENCY, False)
-        BrakeIndex = state.State.BrakeValvePosition.value
-        state.Log("SetBrake(%s[%d])" % (What, BrakeIndex))
-
-        for Button in range(len(self.BrakeList)):
-            self.BrakeList[Button].setChecked(Button == BrakeIndex)
+        BrakeIndex = What.value
+        state.Log("SetBrake(%s[%d])", What, BrakeIndex)
+
+        # Only the old and the new button need to change.  The first
+        # time through we don't know the old one so clear them all.
+        if (self.CheckedBrake is None):
+            for (Index, Button) in enumerate(self.BrakeList):
+                if (Index != BrakeIndex):
+                    Button.setChecked(False)
+        elif (self.CheckedBrake != BrakeIndex):
+            self.BrakeList[self.CheckedBrake].setChecked(False)
+        # Clicking a checked button unchecks it, so always check this one
+        if (not self.BrakeList[BrakeIndex].isChecked()):
+            self.BrakeList[BrakeIndex].setChecked(True)
+        self.CheckedBrake = BrakeIndex
+
+        # The air stops moving when the valve leaves a position, so
+        # stop its sound even if the stroke wasn't finished
+        if ((OldPosition != What) and (OldPosition in VALVE_SOUNDS)):
+            sound.PlaySound.Want(VALVE_SOUNDS[OldPosition], False, True)
+
+        # Emergency happens right away.  All others in the update function
+        if (What == state.BrakeEnum.EMERGENCY) and (OldPosition != What):
+            self.ApplyEmergency()
 
     def UpdateBrake(self, MainWindow):
         """
@@ -342,73 +491,104 @@ class BrakeUi():
 
         :param MainWindow: The top level window
         """
-        if (state.State.BrakeValvePosition == state.BrakeEnum.APPLY):
-            self.RedPressure += APPLY_RATE
-
-            if (self.RedPressure >= MAX_RED_PRESSURE):
-                self.RedPressure = MAX_RED_PRESSURE
-                sound.PlaySound.Stop(sound.SoundEnum.APPLY)
-            else:
-                sound.PlaySound.Play(sound.SoundEnum.APPLY, True)
-                # We used some air from the reservoir so drop the pressure
-                self.BlackPressure -= APPLY_DROP
-
-            # Pressure can never go below 0
-            if (self.BlackPressure < 0):
-                self.BlackPressure = 0
-
-            self.SetGauge()
-            self.PumpAllowed = True
-
-            state.Log("Extend: %f MAX_EXTEND %f" % (self.Extend, MAX_EXTEND))
-            # Are we extending the brake 
-            if (self.Extend < MAX_EXTEND):
-                self.Extend += EXTEND_RATE
-                state.Log("Extending")
-                if (self.Extend > MAX_EXTEND):
-                    self.Extend = MAX_EXTEND
-                state.State.BrakeAcceleration = 0
-            else:
-                state.State.BrakeAcceleration = ComputeBrakeAcceleration(self.RedPressure)
-                state.Log("Braking %f" % state.State.BrakeAcceleration)
-
-        elif (state.State.BrakeValvePosition  == state.BrakeEnum.RELEASE):
-            sound.PlaySound.Play(sound.SoundEnum.RELEASE, True)
-            # We are releasing, so drop brake pressure
-            self.RedPressure -= RELEASE_RATE
-            self.PumpAllowed = True
-            state.State.BrakeAcceleration = 0
-            state.Log("BrakeAcceleration {0}".format(state.State.BrakeAcceleration))
-            if (self.Extend > 0):
-                self.Extend -= EXTEND_RATE
-                if (self.Extend < 0):
-                    self.Extend = 0
-
-            if (self.RedPressure <= 0):
-                self.RedPressure = 0
-                sound.PlaySound.Stop(sound.SoundEnum.RELEASE)
-
-        elif (state.State.BrakeValvePosition  == state.BrakeEnum.LAP):
-            self.PumpAllowed = True
-            # Are we extending the brake 
-            if (self.Extend < MAX_EXTEND):
-                self.Extend += EXTEND_RATE
-                if (self.Extend > MAX_EXTEND):
-                    self.Extend = MAX_EXTEND
-                state.State.BrakeAcceleration = 0
-                state.Log("BrakeAcceleration {0} Extend {1}".format(
-                        state.State.BrakeAcceleration, self.Extend))
-            else:
-                state.State.BrakeAcceleration = ComputeBrakeAcceleration(self.RedPressure)
-                state.Log("BrakeAcceleration %f" % state.State.BrakeAcceleration)
-        elif (state.State.BrakeValvePosition  == state.BrakeEnum.EMERGENCY):
-            self.PumpStop()
-            state.State.BrakeAcceleration = ComputeBrakeAcceleration(MAX_BRAKE_PRESSURE)
-            state.Log("BrakeAcceleration %f" % state.State.BrakeAcceleration)
-        else:
-            printf("Internal error: Impossible brake mode %s" % state.State.BrakeValvePosition )
-            sys.exit(8)
-
+        state.State.BrakeAcceleration = self.BrakeDispatch[state.State.BrakeValvePosition]()
         self.SetGauge()
         self.PumpCheck()
 
+    def UpdateApply(self):
+        """
+        Update the brakes for one tick in APPLY
+
+        :returns: Acceleration caused by the brakes
+        """
+        # Work on locals and store the results once at the end
+        RedPressure = self.RedPressure + APPLY_RATE
+        BlackPressure = self.BlackPressure
+        Extend = self.Extend
+
+        if (RedPressure >= MAX_RED_PRESSURE):
+            RedPressure = MAX_RED_PRESSURE
+            sound.PlaySound.Want(sound.SoundEnum.APPLY, False, True)
+        else:
+            sound.PlaySound.Want(sound.SoundEnum.APPLY, True, True)
+            # We used some air from the reservoir so drop the pressure
+            BlackPressure -= APPLY_DROP
+
+        # Pressure can never go below 0
+        if (BlackPressure < 0):
+            BlackPressure = 0
+
+        self.PumpAllowed = True
+
+        state.Log("Extend: %f MAX_EXTEND %f", Extend, MAX_EXTEND)
+        # Are we extending the brake 
+        if (Extend < MAX_EXTEND):
+            Extend += EXTEND_RATE
+            state.Log("Extending")
+            if (Extend > MAX_EXTEND):
+                Extend = MAX_EXTEND
+            BrakeAcceleration = 0
+        else:
+            BrakeAcceleration = ComputeBrakeAcceleration(RedPressure)
+            state.Log("Braking %f", BrakeAcceleration)
+
+        self.RedPressure = RedPressure
+        self.BlackPressure = BlackPressure
+        self.Extend = Extend
+        return (BrakeAcceleration)
+
+    def UpdateRelease(self):
+        """
+        Update the brakes for one tick in RELEASE
+
+        :returns: Acceleration caused by the brakes
+        """
+        sound.PlaySound.Want(sound.SoundEnum.RELEASE, True, True)
+        # We are releasing, so drop brake pressure
+        RedPressure = self.RedPressure - RELEASE_RATE
+        Extend = self.Extend
+        self.PumpAllowed = True
+        state.Log("BrakeAcceleration %s", 0)
+        if (Extend > 0):
+            Extend -= EXTEND_RATE
+            if (Extend < 0):
+                Extend = 0
+
+        if (RedPressure <= 0):
+            RedPressure = 0
+            sound.PlaySound.Want(sound.SoundEnum.RELEASE, False, True)
+
+        self.RedPressure = RedPressure
+        self.Extend = Extend
+        return (0)
+
+    def UpdateLap(self):
+        """
+        Update the brakes for one tick in LAP
+
+        :returns: Acceleration caused by the brakes
+        """
+        self.PumpAllowed = True
+        Extend = self.Extend
+        # Are we extending the brake 
+        if (Extend < MAX_EXTEND):
+            Extend += EXTEND_RATE
+            if (Extend > MAX_EXTEND):
+                Extend = MAX_EXTEND
+            self.Extend = Extend
+            state.Log("BrakeAcceleration %s Extend %s", 0, Extend)
+            return (0)
+
+        BrakeAcceleration = ComputeBrakeAcceleration(self.RedPressure)
+        state.Log("BrakeAcceleration %f", BrakeAcceleration)
+        return (BrakeAcceleration)
+
+    def UpdateEmergency(self):
+        """
+        Update the brakes for one tick in EMERGENCY
+
+        :returns: Acceleration caused by the brakes
+        """
+        # ApplyEmergency already dumped the air and stopped the pump
+        state.Log("BrakeAcceleration %f", EMERGENCY_ACCEL)
+        return (EMERGENCY_ACCEL)
@@ -23,6 +23,9 @@ from PyQt5.QtCore import Qt, QUrl, QRect
 from PyQt5.QtGui import QBrush, QPen, QFont, QPixmap, QPainter
 
 import state
+import pixmap_cache
+
+RAD_TO_DEG = 180.0 / math.pi    # Radians to degrees conversion factor
 
 class ControllerGraphics():
     """
@@ -38,6 +41,17 @@ class ControllerGraphics():
         MainWindow.SetDirection -- Called to set the direction
 
     """
+    # Run level for each 30 degree step around the controller starting
+    # at -30 degrees (see RUN_TO_ANGLE).  The -120 step is nearest to
+    # Run-8.  The steps straight up are not near any run level, so
+    # they go to Run-0.
+    #              -30 0  30 60 90 120 150 180 -150 -120 -90 -60
+    ANGLE_TO_RUN = (0, 1, 2, 3, 4,  5,  6,  7,   8,   8,  0,  0)
+
+    # Fixed set of attributes, no per instance dictionary
+    __slots__ = ('ControllerScene', 'ControllerHandleItem', 'ControllerHandleRotation',
+                 'RUN_TO_ANGLE', 'ReverseHandleItem', 'MainWindow')
+
     def __init__(self, MainWindow):
         """
         Setup controller window
@@ -56,8 +70,8 @@ class ControllerGraphics():
         self.ControllerScene = QGraphicsScene(0, 0, Width-MARGIN, Height-MARGIN)
 
         # Create the crontroller
-        ControllerBackgroundImage = QPixmap(os.path.join("image", "controller-bg.png"))
-        ControllerBackgroundImageScaled = ControllerBackgroundImage.scaledToHeight(Height - 2 * MARGIN)
+        ControllerBackgroundImage = pixmap_cache.LoadPixmap("controller-bg.png")
+        ControllerBackgroundImageScaled = pixmap_cache.LoadPixmap("controller-bg.png", Height=Height - 2 * MARGIN)
         ControllerBackgroundItem = self.ControllerScene.addPixmap(ControllerBackgroundImageScaled)
 
         # Figure out the height of the controller and it's middle
@@ -68,13 +82,13 @@ class ControllerGraphics():
         ControllerBackgroundItem.setPos(CONTROLLER_X_OFFSET, Offset)
 
         # Now put the controller on the controller
-        ControllerHandle = QPixmap(os.path.join("image", "controller-arm.png"))
+        ControllerHandle = pixmap_cache.LoadPixmap("controller-arm.png")
         ControllerScale = float(ControllerBackgroundImageScaled.width()) / \
             float(ControllerBackgroundImage.width()) 
         NewHeight = int(float(ControllerHandle.height()) * ControllerScale)
 
         # Scale the arm
-        ControllerHandleScaled = ControllerHandle.scaledToHeight(NewHeight)
+        ControllerHandleScaled = pixmap_cache.LoadPixmap("controller-arm.png", Height=NewHeight)
 
         self.ControllerHandleItem = self.ControllerScene.addPixmap(ControllerHandleScaled)
 
@@ -89,14 +103,14 @@ class ControllerGraphics():
         CONTROLLER_X_CENTER = 22   # The rotation point of the controller in X
         self.ControllerHandleItem.setTransformOriginPoint(ControllerHandleScaled.height()/2, ControllerHandleScaled.height()/2)
         self.ControllerHandleRotation = 0
-        state.Log("Controller run level %d Angle %d" % (state.State.RunLevel, self.RUN_TO_ANGLE[state.State.RunLevel]))
+        state.Log("Controller run level %d Angle %d", state.State.RunLevel, self.RUN_TO_ANGLE[state.State.RunLevel])
         self.ControllerHandleItem.setRotation(self.RUN_TO_ANGLE[state.State.RunLevel])
 
-        ReverseHandle = QPixmap(os.path.join("image", "reverser.png"))
+        ReverseHandle = pixmap_cache.LoadPixmap("reverser.png")
         NewHeight = int(float(ReverseHandle.height()) * ControllerScale)
 
         # Scale the reverser
-        ReverseHandleScaled = ReverseHandle.scaledToHeight(NewHeight)
+        ReverseHandleScaled = pixmap_cache.LoadPixmap("reverser.png", Height=NewHeight)
 
         self.ReverseHandleItem = self.ControllerScene.addPixmap(ReverseHandleScaled)
         REVERSE_HANDLE_X_POS = 64      # Position of the handle in X
@@ -114,7 +128,7 @@ class ControllerGraphics():
         """
         Reset the controller and the reverser
         """
-        state.Log("Controller run level %d Angle %d" % (state.State.RunLevel, self.RUN_TO_ANGLE[RunLevel]))
+        state.Log("Controller run level %d Angle %d", state.State.RunLevel, self.RUN_TO_ANGLE[RunLevel])
         self.ControllerHandleItem.setRotation(self.RUN_TO_ANGLE[state.State.RunLevel])
         self.ReverseHandleItem.setRotation(0)  
 
@@ -124,7 +138,7 @@ class ControllerGraphics():
 
         :param RunLevel: The run level to use
         """
-        state.Log("Controller run level %d Angle %d" % (RunLevel, self.RUN_TO_ANGLE[RunLevel]))
+        state.Log("Controller run level %d Angle %d", RunLevel, self.RUN_TO_ANGLE[RunLevel])
         self.ControllerHandleItem.setRotation(self.RUN_TO_ANGLE[RunLevel])
 
     def SetReverse(self, Direction):
@@ -158,25 +172,22 @@ class ControllerGraphics():
         REVERSER_Y_CENTER = 55  # Center of the controller in Y
         REVERSER_Y_WIDTH = 8    # Width of the reverser
 
+        MainWindow = self.MainWindow
         if (x <= REVERSER_X):
+            DirectionEnum = state.DirectionEnum
             if (y > (REVERSER_Y_CENTER + REVERSER_Y_WIDTH)): 
-                self.MainWindow.SetDirection(state.DirectionEnum.REVERSE)
+                MainWindow.SetDirection(DirectionEnum.REVERSE)
             elif (y < (REVERSER_Y_CENTER - REVERSER_Y_WIDTH)): 
-                self.MainWindow.SetDirection(state.DirectionEnum.FORWARD)
+                MainWindow.SetDirection(DirectionEnum.FORWARD)
             else:
-                self.MainWindow.SetDirection(state.DirectionEnum.NEUTRAL)
+                MainWindow.SetDirection(DirectionEnum.NEUTRAL)
             return
 
-        Angle = math.degrees(math.atan2(y-CONTROLLER_CLICK_Y, x-CONTROLLER_CLICK_X))
+        Angle = math.atan2(y-CONTROLLER_CLICK_Y, x-CONTROLLER_CLICK_X) * RAD_TO_DEG
 
-        ClosestDelta = 9999
-        # Loop through each runlevel to find nearest angle
-        for Index in range(len(self.RUN_TO_ANGLE)):
-            if (abs(Angle-self.RUN_TO_ANGLE[Index]) < ClosestDelta):
-                RunLevel = Index
-                ClosestDelta = abs(Angle-self.RUN_TO_ANGLE[Index])
-
-        self.MainWindow.SetRun(RunLevel)
+        # Round to the nearest 30 degree step.  Step 0 is -30 degrees.
+        Step = int(math.floor((Angle + 45) / 30)) % 12
+        MainWindow.SetRun(self.ANGLE_TO_RUN[Step])
 
 class ControllerButtons():
     """
@@ -190,6 +201,9 @@ class ControllerButtons():
         MainWindow.SetRun -- Called to set run level
         MainWindow.SetDirection -- Called to set the direction
     """
+    # Fixed set of attributes, no per instance dictionary
+    __slots__ = ('MainWindow', 'RunList', 'DirectionList', 'CheckedRun', 'CheckedDirection')
+
     def __init__(self, MainWindow):
         """
         Setup controller window
@@ -220,14 +234,26 @@ class ControllerButtons():
         MainWindow.ReverseButton.clicked.connect(lambda: MainWindow.SetDirection(state.DirectionEnum.REVERSE))
         self.DirectionList = [MainWindow.ForwardButton, MainWindow.NeutralButton, MainWindow.ReverseButton]
 
+        # Index of the button that is checked (None = don't know yet)
+        self.CheckedRun = None
+        self.CheckedDirection = None
+
     def SetControllerRun(self, RunLevel):
         """
         Set the run level for the controller
 
         :param RunLevel: The run level to use
         """
-        for Button in range(len(self.RunList)):
-            self.RunList[Button].setChecked(Button == RunLevel)
+        # Only the old and the new button need to change
+        if (self.CheckedRun is None):
+            for (Index, Button) in enumerate(self.RunList):
+                if (Index != RunLevel):
+                    Button.setChecked(False)
+        elif (self.CheckedRun != RunLevel):
+            self.RunList[self.CheckedRun].setChecked(False)
+        if (not self.RunList[RunLevel].isChecked()):
+            self.RunList[RunLevel].setChecked(True)
+        self.CheckedRun = RunLevel
 
     def ControllerReset(self):
         """
@@ -242,6 +268,15 @@ class ControllerButtons():
 
         :param Reverse: The reverse position
         """
-        for Button in range(len(self.DirectionList)):
-            self.DirectionList[Button].setChecked(Button == Direction.value)
+        # Only the old and the new button need to change
+        NewButton = Direction.value
+        if (self.CheckedDirection is None):
+            for (Index, Button) in enumerate(self.DirectionList):
+                if (Index != NewButton):
+                    Button.setChecked(False)
+        elif (self.CheckedDirection != NewButton):
+            self.DirectionList[self.CheckedDirection].setChecked(False)
+        if (not self.DirectionList[NewButton].isChecked()):
+            self.DirectionList[NewButton].setChecked(True)
+        self.CheckedDirection = NewButton
 
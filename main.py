@@ -9,6 +9,9 @@ TODO:
         Add replay/playback mode
 """
 import sys
+import array
+import bisect
+import collections
 import pprint   #pylint: disable=W0611
 import platform
 import time
@@ -22,7 +25,7 @@ import os
 from PyQt5 import QtWidgets, QtCore
 from PyQt5.QtWidgets import ( QApplication, QDialog, QMainWindow, QMessageBox )
 from PyQt5.QtWidgets import QGraphicsScene, QGraphicsView, QGraphicsEllipseItem, QGraphicsRectItem, QGraphicsLineItem, QGraphicsTextItem
-from PyQt5.QtCore import Qt, QUrl, QRect
+from PyQt5.QtCore import Qt, QUrl, QRect, pyqtSignal
 from PyQt5.QtGui import QBrush, QPen, QFont, QPixmap, QPainter
 
 import mode_window
@@ -32,6 +35,8 @@ import state
 import controller
 import sound
 import video_player
+import pixmap_cache
+import modes
 
 if '_PYI_APPLICATION_HOME_DIR' in os.environ:
     DIR=os.environ['_PYI_APPLICATION_HOME_DIR']
@@ -41,585 +46,31 @@ else:
 
 VideoFile = DIR + "/video/trolley.m4v"
 
+SYSTEM = platform.system()     # The operating system we are running on
+
 class ModeEnum(enum.Enum):
     EASY = 0         # Mode is easy
     START_STOP = 1   # Mode is start/stop
     FULL = 2         # Mode is full checking
 
-#----------------------------------------------------------------
-# Physics section
-#
-# Speed is measured in playback rate.  1.0 is normal playback speed
-# Run1 at full speed is 1.5
-# Run2 at full speed is 2.0
-# Run3 at full speed is 2.5
-#
-# These speeds are based on the speed of the video and have no scientific
-# justification.
-#
-# Acceleration is defined A=VT. V is defined by MAX_SPEED.
-# The time to reach full speed is set to SPEED_TIME or 6 seconds.
-# (Again an estimation)
-#----------------------------------------------------------------
-MIN_SPEED=0.5   # Vlc won't move at lower speeds
-#            0    1    2    3    4     5     6     7      8
-MAX_SPEED = [0.5, 1.5, 2.0, 2.5, -1.0, -1.0, -1.0, -1.0, -1.0]
-SPEED_TIME = 6  # Number of seconds it takes to get to full speed.
-
-FRICTION=0.99995   # Friction is 0.005% of the current speed
-
-MAX_RUN_TIME=10 # Longest we can run in anything but full series or full parallel
-MAX_DOWN_TIME=1 # Longest we can stay in a run level going down
-
-# Signal section
-MAX_SIGNAL_START=10     # You must move within 10 seconds of issuing start signal
-MAX_START_BETWEEN=2     # The ding ding that starts must occur within 2 seconds
-STOP_TIME_CHECK=10      # Check stop signal 10 seconds after stop
-STOP_SIGNAL_TIME=2      # Must have two seconds before stop to avoid confusion
-
-STORE_POSITION=0.95     # Beginning of the store
+# For each mode, the help video and the class that runs it
+MODE_INFO = {
+    ModeEnum.EASY:       ("video/easy.mp4",       modes.EasyMode),
+    ModeEnum.START_STOP: ("video/start-stop.mp4", modes.StartStopMode),
+    ModeEnum.FULL:       ("video/full.mp4",       modes.FullMode)
+}
+
 END_OF_VIDEO=0.98       # After this there is no more video
+SEEK_EPSILON=0.01       # Positions below this mean the seek to the start is done
+SEEK_TIMEOUT = 500      # Milliseconds to wait for the seek to the start
+RATE_CHANGE = 0.01      # Smallest speed change worth telling the video player about
+TICK_TIME = 0.1         # Seconds between ticks
+LOG_FLUSH_TIME = 1000   # Milliseconds between log file writes
+WARNING_LINES = 5       # Number of warnings shown on the main window
+MAX_PHYSICS_STEPS = 4   # Most physics updates to catch up on in one tick
 
 CLICK_CLACK_NORMAL_INTERVAL = 3.0       # Click/clack 3 seconds at normal speed
-
-CENTRAL_BELL_START = 0.36       # Location to start sounding central bell
-CENTRAL_BELL_STOP = 0.45        # Location to stop sounding central bell
-
-def ComputeAcceleration(Level):
-    """
-    Given a run level, compute the acceleration for that run level
-
-    :param Level: The run level
-    :returns: Acceleration
-    """
-    global MAX_SPEED
-    global SPEED_TIME
-
-    return((MAX_SPEED[Level] - MAX_SPEED[Level-1]) / SPEED_TIME)
-
-class EasyMode:
-    Name = "Easy Mode"
-    """
-    Class that defines the easy mode of operation.
-
-    In this mode you can press Run0, Run1, Run2. 
-    Run0 will brake the trolley until it stops.
-    Run1 will accelerate to the Run1 speed.  If you are faster that that it brakes.
-    Run2 will accelerate to the Run2 speed.  If you are faster that that we have an internal error
-    """
-    def __init__(self):                 # EasyMode
-        # The deacceleration speed
-        self.SlowDownAcceleration = -0.5
-        self.CentralSounding = False
-
-    """
-    Mode where you move by setting Run-1 and Run-2.  
-    Moving the controller back will slow you down.
-
-    :param: MainWindow -- The main window
-    """
-    def ModeSetRun(self, MainWindow, RunLevel):         # Easymode
-        """
-        Set the run level
-
-        :param MainWindow: The Top level window
-        :param RunLevel: RunLevel to set
-        """
-        state.Log("Runlevel Old %d New %d" % (state.State.RunLevel, RunLevel))
-        # First do nothing if the run level does not change
-        if (RunLevel == state.State.RunLevel):
-            return (True)
-
-        # Find the maximum speed
-        self.MaxSpeed = MAX_SPEED[RunLevel]
-
-        # Run0 has special speed
-        if (RunLevel == 0):
-            self.MaxSpeed = 0
-
-        # Don't let us fall below the minimum
-        # VLC don't really move right with speeds from 0 to 0.5
-        if (RunLevel > 0) and (state.State.Speed < MIN_SPEED):
-            state.State.Speed = MIN_SPEED
-            state.Log("Speed %f" % state.State.Speed)
-
-        # Decide what type of acceleration we need
-        if (state.State.Speed > self.MaxSpeed):
-            state.State.Acceleration = self.SlowDownAcceleration
-            state.Log("Acceleration %1.3f" % state.State.Acceleration)
-        else:
-            state.State.Acceleration = ComputeAcceleration(RunLevel)
-            state.Log("Acceleration %1.3f" % state.State.Acceleration)
-        return True
-
-    def ModeReset(self):                    # EasyMode
-        """
-        Called to reset the mode
-
-        """
-        self.MaxSpeed = 0
-        state.State.Reset()
-
-    def ModeUpdate(self, MainWindow):                   # EasyMode
-        """
-        Return the updated speed
-
-        :param MainWindow: The main window
-        """
-
-        # Increase speed based on acceleration 
-        # The 10.0 is because we update 10 times a second
-        state.State.Speed += (state.State.Acceleration/10.0)         
-        state.Log("Speed %1.3f" % state.State.Speed)
-
-        if (state.State.Acceleration > 0):
-            if (state.State.Speed > self.MaxSpeed):
-                state.State.Acceleration = 0
-                state.State.Speed = self.MaxSpeed
-                state.Log("Speed %1.3f" % state.State.Speed)
-        else:
-            if (state.State.Speed < 0):
-                state.State.Acceleration = 0
-                state.State.Speed = 0
-                state.Log("Speed %1.3f" % state.State.Speed)
-
-        ##@@ Make common code
-        if ((MainWindow.MediaPlayer.get_position() >= CENTRAL_BELL_START) and 
-            (not self.CentralSounding)):
-            self.CentralSounding = True
-            sound.PlaySound.Play(sound.SoundEnum.CENTRAL_BELL, True)
-
-        if ((MainWindow.MediaPlayer.get_position() >= CENTRAL_BELL_STOP) and 
-            (self.CentralSounding)):
-            self.CentralSounding = False
-            sound.PlaySound.Stop(sound.SoundEnum.CENTRAL_BELL)
-
-    def RulesCheck(self, MainWindow):   # EasyMode
-        """
-        Check to see if we violated any of the rules
-
-        :param MainWindow: Top level window
-
-        :returns: True if it's safe to contine
-        """
-        if (not state.State.Deadman) and ((state.State.Speed != 0) or (state.State.RunLevel != 0)):
-            state.Log("MediaPlayer.pause()")
-            Result = MainWindow.MediaPlayer.pause()
-            MainWindow.ErrorDeadman()
-            MainWindow.MainReset()
-            return False
-        return True
-
-class StartStopMode:
-    """
-    Mode where you move by setting Run-1 and Run-2.  
-    Moviing the controller back does nothing.
-
-    Brakes work.
-    """
-    Name = "Start/Stop Mode"
-
-    def __init__(self):
-        self.CentralSounding = False
-
-    def ModeSetRun(self, MainWindow, RunLevel):         # StartStopMode
-        """
-        Set the run level
-
-        :param MainWindow: Main window
-        :param RunLevel: Run level selected
-
-        :returns: True if we should contine, false if should reset
-        """
-        # First we check to see if the RunLevel has changed
-        if (state.State.RunLevel != RunLevel):
-            self.LastRunLevel = state.State.RunLevel
-            self.RunLevelTime = time.time()
-            # Now we need to check if we've exceeded the limits on run level
-            # If so, we will error out and stop the simulation
-            if (MAX_SPEED[RunLevel] < 0):
-                MainWindow.ErrorMessageRun4()
-                return False
-
-            # Run level is acceptable.
-            # Now we need to decide if we need to accelerate.
-            # If we are moving, then we compute the acceleration in (video speed/tick)
-            # by checking how much it takes to go from one run speed to another in the
-            # time needed to reach maximum speed
-            if (RunLevel != 0):
-                state.State.Acceleration = ComputeAcceleration(RunLevel)
-                state.Log("Acceleration %1.3f" % state.State.Acceleration)
-
-                # Save off the maximum speed for this run level
-                self.MaxSpeed = MAX_SPEED[RunLevel]
-            else:
-                # We are run level 0.  So we coast (as far as the motor is concerned)
-                # The brake will play with this number later
-                state.State.Acceleration = 0
-                state.Log("Acceleration %1.3f" % state.State.Acceleration)
-
-        if (self.MaxSpeed < state.State.Speed):
-            state.State.Acceleration = 0
-            state.Log("Acceleration %1.3f" % state.State.Acceleration)
-            state.State.Speed = self.MaxSpeed
-            state.Log("Speed %1.3f" % state.State.Speed)
-            
-        state.Log("StartStopMode: SetRunLevel %d Acceleration %1.3f" % (RunLevel, state.State.Acceleration))
-        return (True)
-
-    def ModeReset(self):            # StartStopMode
-        """
-        Called to reset the mode
-
-        """
-        state.State.Reset()
-        self.MaxSpeed = 0
-        self.LastRunLevel = 0
-
-    def ModeUpdate(self, MainWindow):           # StartStopMode
-        """
-        Return the updated speed
-
-        :param MainWindow: Main window
-        """
-
-        # Increase speed based on acceleration 
-        # The 10.0 is because we update 10 times a second
-        state.State.Speed += ((state.State.Acceleration + state.State.BrakeAcceleration)/10.0)          
-        state.Log("Speed %f No FRICTION" % state.State.Speed)
-        state.State.Speed *= FRICTION
-        state.Log("Speed %f FRICTION" % state.State.Speed)
-
-        if (state.State.Speed < 0):
-            state.State.Speed = 0
-            state.Log("Speed %f" % state.State.Speed)
-
-        state.Log("Acceleration {0} BrakeAcceleration: {1}".format( \
-                state.State.Acceleration, state.State.BrakeAcceleration))
-
-        if (state.State.Acceleration > 0):
-            if (state.State.Speed > self.MaxSpeed):
-                state.State.Speed = self.MaxSpeed
-                state.Log("Speed %f" % state.State.Speed)
-                state.State.Acceleration = 0
-                state.Log("Acceleration %f" % state.State.Acceleration)
-        else:
-            if (state.State.Speed < 0):
-                state.State.Speed = 0
-                state.Log("Speed %f" % state.State.Speed)
-                state.State.Acceleration = 0
-                state.Log("Acceleration %f" % state.State.Acceleration)
-
-        if ((MainWindow.MediaPlayer.get_position() >= CENTRAL_BELL_START) and (not self.CentralSounding)):
-            self.CentralSounding = True
-            sound.PlaySound.Play(sound.SoundEnum.CENTRAL_BELL, True)
-
-        if ((MainWindow.MediaPlayer.get_position() >= CENTRAL_BELL_STOP) and (self.CentralSounding)):
-            self.CentralSounding = False
-            sound.PlaySound.Stop(sound.SoundEnum.CENTRAL_BELL)
-
-
-    def RulesCheck(self, MainWindow):   # Start stop mode
-        """
-        Check to see if we violated any of the rules
-
-        :param MainWindow: Top level window
-
-        :returns: True if it's safe to contine
-        """
-        # The deadman must be pressed if we are moving or trying to run
-        if (not state.State.Deadman) and \
-            ((state.State.Speed != 0) or (state.State.RunLevel != 0)):
-            state.Log("StartStop: Deadman %d %f %d" % \
-                 (state.State.Deadman, state.State.Speed, state.State.RunLevel))
-            MainWindow.ErrorDeadman()
-            MainWindow.MainReset()
-            return False
-
-        # If we are moving or trying to the brake must be released
-        if ((state.State.RunLevel != 0) and \
-            (state.State.BrakeValvePosition != state.BrakeEnum.RELEASE)):
-            MainWindow.ErrorMoveWithBrakesOn()
-            MainWindow.MainReset()
-            return False
-
-        # We are only allowed to move in the forward direction
-        if ((state.State.RunLevel != 0) and \
-            (state.State.Direction != state.DirectionEnum.FORWARD)):
-            MainWindow.ErrorNoForward()
-            MainWindow.MainReset()
-            return False
-
-        if (state.State.RunLevel != 0):
-            # Get the time of the last element of the run info file
-            TimeDiff = time.time() - self.RunLevelTime
-
-            if (state.State.RunLevel > self.LastRunLevel):
-                if (TimeDiff > MAX_RUN_TIME):
-                    MainWindow.ErrorRunTooLong()
-                    MainWindow.MainReset()
-                    return (False)
-            else:
-                if (TimeDiff > MAX_DOWN_TIME):
-                    MainWindow.ErrorRunTooLongDown()
-                    MainWindow.MainReset()
-                    return (False)
-
-        return True
-
-class FullMode(StartStopMode):
-    """
-    Make sure we follow all the rules.
-
-    Rules:
-        1. Two dings before each start
-        2. One ding after stop.
-        3. Stop at broadway
-        4. Sound bell when crossing.
-        5. Sound bell when crossing center.
-        6. Stop at CB4
-        7. No power at Zorch point / broadway spur
-        8. Bell crossing broadway
-        9. No power at Zorch point / main spur
-        10. Stop at thomas
-        11. Stop at store
-    """
-
-    ########
-    ######## Stop information
-    ########
-    BROADWAY_STOP_BEGIN=0.09        # Position of the start of where can do a Broadway stop
-    BROADWAY_STOP_END=0.12          # Position of the end of where can do a Broadway stop
-    BROADWAY_STOP_CHECK=0.15        # Position of where we check to see if Broadway stop done
-    ##@@ REmove above
-
-    CB4_STOP_BEGIN=0.58             # Position of the start of where can do a CB4 stop
-    CB4_STOP_END=0.61               # Position of the end of where can do a CB4 stop
-
-    ##@@ Make real
-    THOMAS_STOP_BEGIN=0.87           # Position of the start of the Thomas stop
-    THOMAS_STOP_END=0.93             # Position of the end of the Thomas stop
-
-    STOP_CHECKS_START = (BROADWAY_STOP_BEGIN, CB4_STOP_BEGIN, THOMAS_STOP_BEGIN)
-    STOP_CHECKS_END =   (BROADWAY_STOP_END,   CB4_STOP_END,   THOMAS_STOP_BEGIN)
-    STOP_MESSAGE    =   ("Broadway",          "Carbarn 2",    "Thomas")
-
-    ########
-    ######## Crossing information
-    ########
-    BROADWAY_NORTH_BEGIN=0.12       # Position where we start crossing Broadway
-    BROADWAY_NORTH_END=0.15         # Position where we stop crossing Broadway
-    
-    CENTRAL_BEGIN=0.39              # Where we start crossing Central Ave.
-    CENTRAL_END=0.42                # Where we start crossing Central Ave.
-
-    BROADWAY_SOUTH_BEGIN=0.70       # Position where we start crossing Broadway (South)
-    BROADWAY_SOUTH_END=0.75         # Position where we stop crossing Broadway (South)
-
-    CROSSING_START   = (BROADWAY_NORTH_BEGIN, CENTRAL_BEGIN, BROADWAY_SOUTH_END)
-    CROSSING_END     = (BROADWAY_NORTH_END,   CENTRAL_END,   BROADWAY_SOUTH_END)
-    CROSSING_MESSAGE = ("Broadway north",     "Central",     "Broadway South")
-
-    CROSSING_DING_COUNT=3           # Number of dings needed at each crossing
-
-    ########
-    ######## Zorch information
-    ########
-    ZORCH1_POS_START=0.70                 # Zorch position 1 start
-    ZORCH2_POS_START=0.77                 # Zorch position 2 start
-    ZORCH1_POS_END=0.73                   # Zorch position 1 ending
-    ZORCH2_POS_END=0.79                   # Zorch position 2 ending
-
-    ZORCH_START   = (ZORCH1_POS_START, ZORCH2_POS_START)
-    ZORCH_END     = (ZORCH1_POS_END,   ZORCH2_POS_END)
-    ZORCH_MESSAGE = ("Carbarn1 lead", "Main line spur")
-
-    Name = "Full Mode"
-
-    def __init__(self):
-        self.CentralSounding = False
-
-    def ModeSetRun(self, MainWindow, RunLevel):         # FullMode
-        """
-        Set the run level
-
-        :param MainWindow: Main window
-        :param RunLevel: Run level selected
-
-        :returns: True if we should continue, false if should reset
-        """
-        Continue = super().ModeSetRun(MainWindow, RunLevel)
-        state.Log("Continue %s" % Continue)
-        return (Continue)
-
-    def ModeReset(self):            # FullMode
-        """
-        Called to reset the mode
-
-        """
-        super().ModeReset()
-        # These two variables are used to detect starts and stops
-        self.LastSpeed = 0              # The speed before this one
-        self.CurrentSpeed = 0           # The speed we have now
-
-        self.StopTime = 0               # Time of last stop is old
-
-        self.StopCheckDone = [False, False, False]      # Have we checked for a stop
-        self.CrossingCheckDone = [False, False, False]  # Did we ring at a crossing
-        self.ZorchDone = [False, False]                 # Did we do a zorch
-
-    def ModeUpdate(self, MainWindow):           # FullMode
-        """
-        Return the updated speed
-
-        :param MainWindow: Main window
-        """
-        super().ModeUpdate(MainWindow)
-        self.LastSpeed = self.CurrentSpeed
-        self.CurrentSpeed = state.State.Speed
-
-    def DingCount(self, DingPosition, Start, End):
-        """
-        Return the number of dings in the interval
-
-        :param DingPosition: List of ding positions
-        :param Start: When to start counting
-        :param End: When to stop counting
-
-        :returns: Number of dings seen
-        """
-        Result = 0
-        for ADing in DingPosition:
-            if (ADing >= Start) and (ADing <= End):
-                Result += 1
-        return (Result)
-
-    def CheckStartStopDing(self, MainWindow):
-        """
-        Checks to see if we started or stopped and did 
-        the dings correctly
-
-        :param MainWindow: The main window
-
-        Notes:
-            DingTime -- When we did each ding
-
-        """
-        # See if we went from stopped to moving
-        if (self.LastSpeed == 0) and (self.CurrentSpeed != 0):
-            # Now check to see if the operator did ding-ding before moving
-            # There must be two dings in the last 10 seconds
-            # and they must be less than 2 seconds apart
-
-            # Do we have two dings
-            if (len(MainWindow.DingTime) < 2):
-                MainWindow.AddWarning("Started moving without sounding start signal")
-            else:
-                # Current time 1000 Ding time 999 Good=true
-                # Current time 1000 Ding time 900 Good=false
-
-                # Did we signal within the last 10 seconds
-                if (time.time() - MainWindow.DingTime[-2] > MAX_SIGNAL_START):
-                    MainWindow.AddWarning("Started moving without sounding start signal")
-                # Are the ding ding more than 2 seconds apart
-                elif ((MainWindow.DingTime[-1] - MainWindow.DingTime[-2]) > MAX_START_BETWEEN):
-                    MainWindow.AddWarning("Start signal is ding-ding not ding-wait-ding")
-
-        # Did we ding after stopping
-        if (len(MainWindow.DingTime) > 0):
-            if (MainWindow.DingTime[-1] >= self.StopTime):
-                LastDing = MainWindow.DingTime[-1]
-            else:
-                LastDing = 0
-        else:
-            LastDing = 0
-
-        if (self.StopTime != 0) and \
-            ((time.time() - self.StopTime >= STOP_TIME_CHECK) or (LastDing > self.StopTime)):
-            # There should be one ding in the last second
-
-            DingLen = len(MainWindow.DingTime)
-            # Check to see if signal missed
-            if (DingLen == 0):
-                MainWindow.AddWarning("No stop signal")
-            else:
-                # Check to see if single ding.  (Occurs when start signal missed)
-                if ((time.time() - MainWindow.DingTime[-1]) > STOP_SIGNAL_TIME):
-                    MainWindow.AddWarning("Stop Signal too slow or missing")
-                elif (DingLen > 1):
-                    if ((MainWindow.DingTime[-1] -  \
-                                MainWindow.DingTime[-2]) < STOP_SIGNAL_TIME):
-                        MainWindow.AddWarning("Stop Signal confused with other signals")
-
-            self.StopTime = 0   # We've looked at this so clear it
-
-        if (self.LastSpeed != 0) and (self.CurrentSpeed == 0):
-            self.StopTime = time.time()
-
-    def RulesCheck(self, MainWindow):   # Full mode
-        """
-        Check to see if we violated any of the rules
-
-        :param MainWindow: Top level window
-
-        :returns: True if it's safe to continue
-        """
-        Continue = super().RulesCheck(MainWindow)
-        if (not Continue):
-            return (Continue)
-
-        self.CheckStartStopDing(MainWindow)
-
-        # Check bell at crossing
-        for Index in range(len(self.CROSSING_START)):
-            if (self.CrossingCheckDone[Index]):
-                continue
-
-            if (MainWindow.MediaPlayer.get_position() >= self.CROSSING_END[Index]):
-               # Get the number of times we dinged here
-               DingDingDing = self.DingCount(MainWindow.DingPosition, 
-                   self.CROSSING_START[Index], self.CROSSING_END[Index])
-
-               if (DingDingDing < self.CROSSING_DING_COUNT):
-                   MainWindow.AddWarning("Failed to sound bell crossing %s" % self.CROSSING_MESSAGE[Index])
-
-               self.CrossingCheckDone[Index] = True
-
-        # Check stops
-        for Index in range(len(self.STOP_CHECKS_START)):
-            if (self.StopCheckDone[Index]):
-                continue
-            if ((self.CurrentSpeed == 0) and 
-                (MainWindow.MediaPlayer.get_position() >= self.STOP_CHECKS_START[Index]) and 
-                (MainWindow.MediaPlayer.get_position() <= self.STOP_CHECKS_END[Index])):
-                state.Log("Setting Stop for %s" % self.STOP_MESSAGE[Index])
-                self.StopCheckDone[Index] = True
-                continue
-
-            if (MainWindow.MediaPlayer.get_position() > self.STOP_CHECKS_END[Index]):
-                self.StopCheckDone[Index] = True
-                MainWindow.AddWarning("Failed stop at %s" % self.STOP_MESSAGE[Index])
-
-        # Check Zorching
-        for Index in range(len(self.ZORCH_START)):
-            if ((MainWindow.MediaPlayer.get_position() >= self.ZORCH_START[Index]) and
-                (MainWindow.MediaPlayer.get_position() <= self.ZORCH_END[Index])):
-                if (state.State.RunLevel != 0):
-                    state.Log("Zorch at position %0.2f" % MainWindow.MediaPlayer.get_position())
-                    sound.PlaySound.Play(sound.SoundEnum.ZORCH, False)
-                    if (not self.ZorchDone[Index]):
-                        MainWindow.AddWarning("Zorched %s" % ZORCH_MESSAGE[Index])
-                        self.ZorchDone[Index] = True
-
-        if (MainWindow.MediaPlayer.get_position() > STORE_POSITION) and \
-            (state.State.Speed == 0):
-            state.Log("Stopped correctly at store")
-            MainWindow.DisplayWarnings()
-            MainWindow.GoodStop();
-            MainWindow.MainReset()
-            return (False)
-
-        return True
+CLICK_CLACK_RESCHEDULE = 0.1           # Speed change (fraction) that moves the next click/clack
 
 class SelectWindow(QMainWindow, mode_window.Ui_SelectWindow):
     """
@@ -721,9 +172,9 @@ class BrakeGraphics():
         BRAKE_X_OFFSET = 80             # Move the brake controller over this amount
         BRAKE_HANDLE_X_OFFSET=129       # Move brake handle over this much
         BRAKE_HANDLE_Y_OFFSET=47        # Move handle up this much
-        self.BRAKE_ANGLES=[152, 121, 57, 20]    # Angles for each brake position
+        self.BRAKE_ANGLES=(152, 121, 57, 20)    # Angles for each brake position
         # Information about each brake position
-        self.BRAKE_STATE = [state.BrakeEnum.RELEASE, state.BrakeEnum.LAP, state.BrakeEnum.APPLY, state.BrakeEnum.EMERGENCY]
+        self.BRAKE_STATE = (state.BrakeEnum.RELEASE, state.BrakeEnum.LAP, state.BrakeEnum.APPLY, state.BrakeEnum.EMERGENCY)
         self.BRAKE_MAP = {}
         for Index in range(len(self.BRAKE_ANGLES)):
             self.BRAKE_MAP[self.BRAKE_STATE[Index]] = self.BRAKE_ANGLES[Index]
@@ -731,12 +182,11 @@ class BrakeGraphics():
         Height = MainWindow.BrakeGraphicsView.height()
         Width = MainWindow.BrakeGraphicsView.width()
         self.BrakeControlScene = QGraphicsScene(0, 0, Width-MARGIN, Height-MARGIN)
-        BrakeBackgroundImage = QPixmap(os.path.join("image", "brake-controller.png"))
-        BrakeBackgroundImageScaled = BrakeBackgroundImage.scaledToHeight(Height - 2 * MARGIN)
+        BrakeBackgroundImageScaled = pixmap_cache.LoadPixmap("brake-controller.png", Height=Height - 2 * MARGIN)
         BrakeBackgroundItem = self.BrakeControlScene.addPixmap(BrakeBackgroundImageScaled)
         BrakeBackgroundItem.setPos(BRAKE_X_OFFSET, 0)
 
-        BrakeHandle = QPixmap(os.path.join("image", "brake-handle.png"))
+        BrakeHandle = pixmap_cache.LoadPixmap("brake-handle.png")
         self.BrakeHandleItem = self.BrakeControlScene.addPixmap(BrakeHandle)
 
         # Because end of hande is rounded, we need to move it a little based on height alone
@@ -761,13 +211,12 @@ class BrakeGraphics():
         CENTER_Y = 53   # Center of the Y image
         x = Event.x()
         y = Event.y()
-        ClosestDelta = 9999
+        Angle = math.degrees(math.atan2(y-CENTER_Y, x-CENTER_X))
 
-        for Index in range(len(self.BRAKE_STATE)):
-            Angle = math.degrees(math.atan2(y-CENTER_Y, x-CENTER_X))
-            if (abs(Angle-self.BRAKE_ANGLES[Index]) < ClosestDelta):
-                BrakeLever = self.BRAKE_STATE[Index]
-                ClosestDelta = abs(Angle-self.BRAKE_ANGLES[Index])
+        # The brake position whose angle is closest to the click
+        Index = min(range(len(self.BRAKE_ANGLES)), 
+                key=lambda Index: abs(Angle - self.BRAKE_ANGLES[Index]))
+        BrakeLever = self.BRAKE_STATE[Index]
 
         self.MoveBrakeLever(BrakeLever)
         self.MainWindow.BrakeUi.SetBrake(BrakeLever)
@@ -780,10 +229,89 @@ class BrakeGraphics():
         self.BrakeHandleItem.setRotation(self.BRAKE_MAP[State])
 
 
+# The messages we show.  Name -> (Icon, Title, Heading, Message, Button)
+# A Message of None (or a % template) is filled in each time it is shown.
+MESSAGE_BOXES = {
+    "Deadman": (QMessageBox.Critical, "Deadman not engaged", "Deadman not engaged",
+"""The deadman must be pressed (or clicked) 
+at all times while the trolley is moving.   
+
+If it is released the trolley performs an emergency stop
+""", "Restart"),
+
+    "Done": (QMessageBox.Information, "Finished", "Congratulations: The run is complete",
+"""You've made it around the loop.
+
+Press "Restart" to start another run""", "Restart"),
+
+    "GoodStop": (QMessageBox.Information, "Finished", "Congratulations: The run is complete",
+"""You've made it around the loop.
+
+And you stopped back at the store
+Press "Restart" to start another run""", "Restart"),
+
+    "Run4": (QMessageBox.Critical, "Speed Limit Exceeded", "Speed limit exceeded",
+"""This is not a high speed trolley.
+The loop line speed limit is 15mph.
+It is not possible to use the controller at settings "Run-4" or above
+
+Please try again, only slower""", "Restart"),
+
+    "RunTooLong": (QMessageBox.Critical, "Overheated Resisters", "Overheated Resisters",
+"""You stayed in Run-%d too long.
+
+The resister pack overheated.  
+
+You can only stay in Run-%d for %d seconds.
+""", "OK"),
+
+    "RunTooLongDown": (QMessageBox.Critical, "Electrical Overload", "Electrical Overload",
+"""Going from Run-x to idle should be done
+as quickly as possible.   Failure to do so causes the motors to act as
+generators and create feedback which can damage the trolley.
+
+So slam that controller back to idle and avoid this problem.
+""", "OK"),
+
+    "NoForward": (QMessageBox.Critical, "Reverser not set", "Reverser not set",
+"""You must select "Forward" on the reverser
+before moving.
+
+Controller has been reset to Run-0
+
+Please set direction and try again.""", "OK"),
+
+    "BrakesOn": (QMessageBox.Critical, "Move with brakes on", "Attempt to move with brakes set",
+"""The brakes and the motor should never be on at the same time.
+
+Set the controller to "Run-0" before applying the brakes.
+Release the brakes before entering "Run-1".
+
+Simulation will now reset.
+""", "OK"),
+
+    "ReverserMoved": (QMessageBox.Critical, "Reverser move while car in motion", "Reverser moved while car in motion",
+"""You cannot change the reverser while the trolley is in motion.
+
+Reverser has been returned to "Forward"
+
+Press OK to continue""", "OK"),
+
+    "Warnings": (QMessageBox.Critical, "Warnings", "You made some mistakes",
+None, "Continue"),
+}
+
 class Window(QMainWindow, sim_ui4.Ui_MainWindow):
     """
     Main window in which everything happens
     """
+    # Emitted (from the VLC thread) when the video position changes
+    PositionChanged = pyqtSignal(float)
+    # Emitted (from the VLC thread) when the video starts or stops playing
+    PlayingChanged = pyqtSignal(bool)
+    # Emitted (from a VLC thread) when a sound finishes
+    SoundEnded = pyqtSignal()
+
     def __init__(self, parent=None):
         """
         Create the main window
@@ -810,18 +338,47 @@ class Window(QMainWindow, sim_ui4.Ui_MainWindow):
         self.MediaPlayer.audio_output_device_set("adummy", "/dev/null")
         self.MediaPlayer.audio_set_mute(True)
 
-        if platform.system() == "Linux": # for Linux using the X Server
+        # The video never changes, so open and parse it once
+        self.Media = self.instance.media_new(VideoFile)
+        self.Media.parse()
+        self.MediaPlayer.set_media(self.Media)
+
+        # Let VLC tell us when the position changes instead of
+        # asking for it several times a tick.  The VLC callback runs in
+        # a VLC thread so we pass it through a queued signal.
+        self.Position = 0.0
+        self.PositionChanged.connect(self.PositionUpdate, Qt.QueuedConnection)
+        self.MediaPlayer.event_manager().event_attach(
+            vlc.EventType.MediaPlayerPositionChanged, self.VlcPositionChanged)
+
+        # Restart looping sounds as soon as they end, not at the next tick
+        self.SoundEnded.connect(sound.PlaySound.EndsProcess, Qt.QueuedConnection)
+        sound.PlaySound.EndNotify = self.SoundEnded.emit
+
+        # Same for the player state
+        self.Playing = False
+        self.PlayingChanged.connect(self.PlayingUpdate, Qt.QueuedConnection)
+        for EventType, Playing in (
+                (vlc.EventType.MediaPlayerPlaying, True),
+                (vlc.EventType.MediaPlayerPaused, False),
+                (vlc.EventType.MediaPlayerStopped, False),
+                (vlc.EventType.MediaPlayerEndReached, False)):
+            self.MediaPlayer.event_manager().event_attach(
+                EventType, self.VlcPlayingChanged, Playing)
+
+        if SYSTEM == "Linux": # for Linux using the X Server
             self.MediaPlayer.set_xwindow(int(self.VideoFrame.winId()))
-        elif platform.system() == "Windows": # for Windows
+        elif SYSTEM == "Windows": # for Windows
             self.MediaPlayer.set_hwnd(int(self.VideoFrame.winId()))
-        elif platform.system() == "Darwin": # for MacOS
+        elif SYSTEM == "Darwin": # for MacOS
             self.MediaPlayer.set_nsobject(int(self.VideoFrame.winId()))
 
-        self.VideoFrame.setStyleSheet("""
-            background-image: url(%s/background.png) 0 0 0 0 stretch stretch;
-            background-repeat: no-repeat;
-            background-position: center;
-            """ % os.path.join(DIR, "image"))
+        # The background behind the video.  A style sheet image gets
+        # stretched on every paint, so use a label and only scale the
+        # picture when the frame changes size.
+        self.Background = QtWidgets.QLabel(self.VideoFrame)
+        self.Background.lower()
+        self.VideoFrame.installEventFilter(self)
 
         self.BrakeUi = brake_ui.BrakeUi(self)
 
@@ -832,13 +389,43 @@ class Window(QMainWindow, sim_ui4.Ui_MainWindow):
         self.ControllerGraphics = controller.ControllerGraphics(self)
         self.ControllerButtons = controller.ControllerButtons(self)
 
+        # One message box is made the first time we need it and
+        # reused for all the messages after that
+        self.MessageBox = None
+
         self.SelectWindow = SelectWindow()
         self.SelectWindow.SelectApplyButton.clicked.connect(self.SelectApplyButtonClicked)
         self.SelectWindow.SelectCancelButton.clicked.connect(self.SelectCancelButtonClicked)
+        # The click/clack sound runs off its own timer
+        self.ClickClackTimer = QtCore.QTimer(self)
+        self.ClickClackTimer.setTimerType(Qt.PreciseTimer)
+        self.ClickClackTimer.setSingleShot(True)
+        self.ClickClackTimer.timeout.connect(self.ClickClack)
+        self.LastClickClack = 0.0   # When the last click/clack played
+        self.ClickClackSpeed = 0.0  # Speed the click/clack timer was set for
+        self.Ending = False     # Handling the end of the video
+        self.Seeking = False    # Waiting for the seek to the start to finish
+        # If the seek never sends a position (the player was already
+        # at the start or stopped) stop waiting after a while
+        self.SeekTimer = QtCore.QTimer(self)
+        self.SeekTimer.setSingleShot(True)
+        self.SeekTimer.timeout.connect(self.SeekDone)
+        self.LastRate = 1.0     # Last rate given to the video player
+        self.LastStatus = ""    # Last text put in the status line
+
+        # The tick timer is single shot.  Each tick schedules the next
+        # one against the clock so timer lateness does not add up.
         self.Timer = QtCore.QTimer(self)
-        self.Timer.setInterval(100)
+        self.Timer.setTimerType(Qt.PreciseTimer)
+        self.Timer.setSingleShot(True)
         self.Timer.timeout.connect(self.Tick)
-        self.Timer.start()
+        self.NextTick = time.monotonic() + TICK_TIME
+        self.Timer.start(int(TICK_TIME * 1000))
+
+        # The log is buffered, write it out every so often
+        self.LogTimer = QtCore.QTimer(self)
+        self.LogTimer.timeout.connect(state.LogFlush)
+        self.LogTimer.start(LOG_FLUSH_TIME)
         self.MainReset()
         self.setWindowTitle("SCRM Trolley")
 
@@ -846,14 +433,78 @@ class Window(QMainWindow, sim_ui4.Ui_MainWindow):
         """
         We were asked to play a video
         """
-        print("### Video %s" % self.SelectWindow.GetMode())
         ModeType = self.SelectWindow.GetMode()
-        if (ModeType == ModeEnum.EASY):
-            video_player.play_video("video/easy.mp4")
-        elif (ModeType == ModeEnum.START_STOP):
-            video_player.play_video("video/start_stop.mp4")
-        elif (ModeType == ModeEnum.FULL):
-            video_player.play_video("video/full.mp4")
+        print("### Video %s" % ModeType)
+        video_player.play_video(MODE_INFO[ModeType][0])
+
+    def VlcPositionChanged(self, Event):
+        """
+        VLC event handler for a position change (VLC thread)
+
+        :param Event: The VLC event
+        """
+        self.PositionChanged.emit(Event.u.new_position)
+
+    def PositionUpdate(self, Position):
+        """
+        Record the new video position (GUI thread)
+
+        :param Position: The new position (0.0 - 1.0)
+        """
+        # VLC seeks in the background so after a reset we can still
+        # get positions from the old run.  Ignore them until the seek
+        # to the start shows up.
+        if (self.Seeking):
+            if (Position > SEEK_EPSILON):
+                return
+            self.SeekDone()
+
+        self.Position = Position
+        self.Mode.Watcher.Update(self, Position)
+        if (Position > END_OF_VIDEO):
+            self.EndOfVideo()
+
+    def SeekDone(self):
+        """
+        The seek to the start is done (or we've given up waiting)
+        """
+        self.SeekTimer.stop()
+        self.Seeking = False
+
+    def VlcPlayingChanged(self, Event, Playing):
+        """
+        VLC event handler for a player state change (VLC thread)
+
+        :param Event: The VLC event
+        :param Playing: True if the event means we are now playing
+        """
+        self.PlayingChanged.emit(Playing)
+
+    def PlayingUpdate(self, Playing):
+        """
+        Record whether the video is playing (GUI thread)
+
+        :param Playing: True if the video is playing
+        """
+        self.Playing = Playing
+
+    def VideoPlay(self):
+        """
+        Start (or continue) the video.  We don't wait for VLC to
+        tell us it's playing, its event just confirms it.
+        """
+        state.Log("MediaPlayer.play()")
+        self.MediaPlayer.play()
+        self.Playing = True
+
+    def VideoPause(self):
+        """
+        Pause the video.  pause() flips between play and pause, so
+        use set_pause which always pauses.
+        """
+        state.Log("MediaPlayer.set_pause(1)")
+        self.MediaPlayer.set_pause(1)
+        self.Playing = False
 
     def HelpClicked(self):
         """
@@ -868,8 +519,18 @@ class Window(QMainWindow, sim_ui4.Ui_MainWindow):
         :param Checked: Is it checked
         """
         state.State.Deadman = Checked
-        self.DeadmanButton.setChecked(Checked)
-        self.DeadmanGraphic.setChecked(Checked)
+        self.SetDeadmanChecked(Checked)
+
+    def SetDeadmanChecked(self, Checked):
+        """
+        Make both deadman controls show the same state.  Only the
+        ones that are different are touched.
+
+        :param Checked: Should they be checked
+        """
+        for Button in (self.DeadmanButton, self.DeadmanGraphic):
+            if (Button.isChecked() != Checked):
+                Button.setChecked(Checked)
 
     def SelectApplyButtonClicked(self):
         """
@@ -889,76 +550,145 @@ class Window(QMainWindow, sim_ui4.Ui_MainWindow):
         """ 
         The clock has ticked.  Take action
         """
+        Now = time.monotonic()
+
+        # Schedule the next tick first so we keep ticking however
+        # we leave.  If we are way behind, start again from now.
+        self.NextTick += TICK_TIME
+        if (self.NextTick < Now):
+            self.NextTick = Now + TICK_TIME
+        self.Timer.start(int((self.NextTick - Now) * 1000))
+
+        # The timer does not fire exactly every 100ms, so run the
+        # physics in fixed steps for the time that has really passed.
+        # If we fall too far behind (window dragged, dialog up) we
+        # drop the extra time rather than trying to catch up.
+        self.TickBacklog += Now - self.LastTick
+        self.LastTick = Now
+        Steps = int(self.TickBacklog / modes.PHYSICS_STEP)
+        self.TickBacklog -= Steps * modes.PHYSICS_STEP
+
         # Update the speed and acceleration
-        self.BrakeUi.UpdateBrake(self)
-        self.Mode.ModeUpdate(self)
-        Continue = self.Mode.RulesCheck(self)
+        BrakeUi = self.BrakeUi
+        UpdateBrake = BrakeUi.UpdateBrake
+        ModeUpdate = self.Mode.ModeUpdate
+        for _ in range(min(Steps, MAX_PHYSICS_STEPS)):
+            UpdateBrake(self)
+            ModeUpdate(self)
+
+        # Nothing has moved if there were no steps, so there are
+        # no new rules to check
+        Continue = True
+        if (Steps > 0):
+            Continue = self.Mode.RulesCheck(self)
+
+        # Start and stop the sounds the updates asked for.  This is
+        # done even if the rules stopped us.
+        sound.PlaySound.Reconcile()
         if (not Continue):
             return
 
-        # Tell the video to change the state
-        self.MediaPlayer.set_rate(state.State.Speed)
-
-        state.Log("ClickClackTime %f" % self.ClickClackTime)
-        if (self.ClickClackTime == 0):
-            if (state.State.Speed > 0.0):
-                state.Log("ClickClackPlay")
-                sound.PlaySound.Play(sound.SoundEnum.CLICK_CLACK, False)
-                self.ClickClackTime = time.monotonic() + CLICK_CLACK_NORMAL_INTERVAL / state.State.Speed
-                state.Log("ClickClackTime %f" % self.ClickClackTime)
-        else:
-            if (time.monotonic() > self.ClickClackTime):
-                if (state.State.Speed > 0):
-                    state.Log("ClickClackPlay")
-                    sound.PlaySound.Play(sound.SoundEnum.CLICK_CLACK, False)
-                    self.ClickClackTime = time.monotonic() + CLICK_CLACK_NORMAL_INTERVAL / state.State.Speed
-                else:   # Not moving, shutdown click/clack
-                    self.ClickClackTime = 0.0
-                state.Log("ClickClackTime %f" % self.ClickClackTime)
+        # Read everything we need once for the rest of the tick
+        State = state.State
+        Speed = State.Speed
+        Position = self.Position
+        Playing = self.Playing
+        MediaPlayer = self.MediaPlayer
+        Log = state.Log
+
+        # Tell the video to change the state.  Changing the rate
+        # makes VLC reconfigure itself, so only do it when the
+        # speed has really changed.
+        if (abs(Speed - self.LastRate) > RATE_CHANGE):
+            MediaPlayer.set_rate(Speed)
+            self.LastRate = Speed
+
+        # Start the click/clack when we start moving.  After that
+        # it runs off its own timer, which we move if the speed
+        # changes a lot between clicks.
+        if (Speed > 0.0):
+            if (not self.ClickClackTimer.isActive()):
+                self.ClickClack()
+            elif (abs(Speed - self.ClickClackSpeed) > CLICK_CLACK_RESCHEDULE * Speed):
+                self.ClickClackSchedule(Now, Speed)
 
         # Are we too close to the end to do anything
-        if (self.MediaPlayer.get_position() < END_OF_VIDEO):
+        if (Position < END_OF_VIDEO):
             # Check to see if we are not playing and moving
-            if ((self.MediaPlayer.get_state() != vlc.State.Playing) and \
-                        (state.State.Speed > 0.0)):
-                state.Log("MediaPlayer.play()")
-                Result = self.MediaPlayer.play()
-
-            elif ((self.MediaPlayer.get_state() == vlc.State.Playing) and \
-                        (state.State.Speed <= 0.0)):
-                state.Log("MediaPlayer.pause()")
-                Result = self.MediaPlayer.pause()
-
-        StatusMsg = "Run %d Position %.2f Speed %.2f Acceleration %.3f Brake Acc. %.3f Brake:%2.2f Res:%2.2f Extend: %f" % \
-             (state.State.RunLevel, self.MediaPlayer.get_position(), state.State.Speed, 
-             state.State.Acceleration, state.State.BrakeAcceleration, self.BrakeUi.RedPressure, self.BrakeUi.BlackPressure, self.BrakeUi.Extend)
-        state.Log(StatusMsg)
-        self.StatusLabel.setText(StatusMsg)
-
-        if (self.MediaPlayer.get_position() > END_OF_VIDEO):
-            state.Log("MediaPlayer.pause()")
-            Result = self.MediaPlayer.pause()
-            self.AddWarning("Failed to stop at store")
-            self.DisplayWarnings()
-            self.NoticeDone()
-            self.MainReset()
+            if ((not Playing) and (Speed > 0.0)):
+                self.VideoPlay()
+
+            elif (Playing and (Speed <= 0.0)):
+                self.VideoPause()
+
+        StatusMsg = "Run %d Position %.2f Speed %.2f Acceleration %.3f Brake Acc. %.3f Brake:%2.2f Res:%2.2f Extend: %.2f" % \
+             (State.RunLevel, Position, Speed, 
+             State.Acceleration, State.BrakeAcceleration, BrakeUi.RedPressure, BrakeUi.BlackPressure, BrakeUi.Extend)
+        # Most ticks nothing shown changes, so don't redo the label
+        # (or log the same line again)
+        if (StatusMsg != self.LastStatus):
+            Log(StatusMsg)
+            self.StatusLabel.setText(StatusMsg)
+            self.LastStatus = StatusMsg
+
+    def ClickClack(self):
+        """
+        Time for the next click/clack of the wheels.  The interval 
+        depends on how fast we are going.
+        """
+        if (state.State.Speed > 0.0):
+            state.Log("ClickClackPlay")
+            sound.PlaySound.Play(sound.SoundEnum.CLICK_CLACK, False)
+            self.LastClickClack = time.monotonic()
+            self.ClickClackSchedule(self.LastClickClack, state.State.Speed)
+
+    def ClickClackSchedule(self, Now, Speed):
+        """
+        Set the timer for the next click/clack, counting from
+        the last one at the current speed.
+
+        :param Now: The current time (time.monotonic())
+        :param Speed: The current speed
+        """
+        self.ClickClackSpeed = Speed
+        Next = self.LastClickClack + CLICK_CLACK_NORMAL_INTERVAL / Speed
+        self.ClickClackTimer.start(max(0, int((Next - Now) * 1000)))
+
+    def EndOfVideo(self):
+        """
+        We ran off the end of the video without stopping at the store
+        """
+        # The dialogs below run the event loop, so more position
+        # events can come in while we are here
+        if (self.Ending):
+            return
+        self.Ending = True
+        self.VideoPause()
+        self.AddWarning("Failed to stop at store")
+        self.DisplayWarnings()
+        self.NoticeDone()
+        self.MainReset()
+        self.Ending = False
 
     def Ding(self):
         """ 
         Ring the bell
         """
-        if (not sound.PlaySound.Running[sound.SoundEnum.BELL1.value]):
-            sound.PlaySound.Play(sound.SoundEnum.BELL1, False)
-        elif (not sound.PlaySound.Running[sound.SoundEnum.BELL2.value]):
-            sound.PlaySound.Play(sound.SoundEnum.BELL2, False)
+        # Use the lowest numbered bell that's not ringing.  If they
+        # all are, the last one gets it.
+        Free = (~sound.PlaySound.RunningMask) & sound.BELL_BITS
+        if (Free):
+            Bell = sound.SoundEnum((Free & -Free).bit_length() - 1)
         else:
-            sound.PlaySound.Play(sound.SoundEnum.BELL3, False)
+            Bell = sound.SoundEnum.BELL3
+        sound.PlaySound.Play(Bell, False)
 
-        ThisDingTime = time.time()
-        DingPosition = self.MediaPlayer.get_position()
+        ThisDingTime = time.monotonic()
+        DingPosition = self.Position
         self.DingTime.append(ThisDingTime)
-        self.DingPosition.append(DingPosition)
-        state.Log("DING Time: %f Pos: %f" % (ThisDingTime, DingPosition))
+        # Kept sorted so DingCount can use a binary search
+        bisect.insort(self.DingPosition, DingPosition)
+        state.Log("DING Time: %f Pos: %f", ThisDingTime, DingPosition)
 
     def ChangeModeClicked(self):
         """
@@ -972,12 +702,7 @@ class Window(QMainWindow, sim_ui4.Ui_MainWindow):
         We are starting out.  Setup the mode
         """
         ModeType = self.SelectWindow.GetMode()
-        if (ModeType == ModeEnum.EASY):
-            self.Mode = EasyMode()
-        elif (ModeType == ModeEnum.START_STOP):
-            self.Mode = StartStopMode()
-        elif (ModeType == ModeEnum.FULL):
-            self.Mode = FullMode()
+        self.Mode = MODE_INFO[ModeType][1]()
 
         self.ModeLabel.setText(self.Mode.Name)
 
@@ -985,35 +710,45 @@ class Window(QMainWindow, sim_ui4.Ui_MainWindow):
         """ 
         Reset to the starting position
         """
+        self.Seeking = True
+        self.SeekTimer.start(SEEK_TIMEOUT)
         self.MediaPlayer.set_position(0.0)
+        self.Position = 0.0
         self.SetSimulatorMode()
         state.State.Reset()
         self.Mode.ModeReset()
-        self.WarningList = []
-        self.WarningLabel.setText("")
+        self.WarningList = []           # All the warnings for this run
+        self.RecentWarnings = collections.deque(maxlen=WARNING_LINES) # The ones on the screen
+        if (self.WarningLabel.text()):
+            self.WarningLabel.setText("")
 
-        self.DeadmanButton.setChecked(False)
-        self.DeadmanGraphic.setChecked(False)
+        self.SetDeadmanChecked(False)
 
         self.SetRun(0)
         self.SetDirection(state.DirectionEnum.NEUTRAL)
 
-        self.Media = self.instance.media_new(VideoFile)
+        # Re-attaching the already parsed media is cheap and gets
+        # the player out of the ended state at the end of a run
         self.MediaPlayer.set_media(self.Media)
-        self.Media.parse()
 
         self.MediaPlayer.set_rate(1.0)
+        self.LastRate = 1.0
 
         self.MediaPlayer.audio_set_volume(0)
-        state.Log("Reset: Pause")
-        self.MediaPlayer.pause()
+        self.VideoPause()
         self.BrakeGUI.MoveBrakeLever(state.BrakeEnum.APPLY)
         self.BrakeUi.SetBrake(state.BrakeEnum.APPLY)
         self.BrakeUi.BrakeReset()
+        sound.PlaySound.Reset()
+
+        # The start/stop checks only look at the last two dings
+        self.DingTime = collections.deque(maxlen=2)
+        # Every ding position is kept (sorted) for the signal checks
+        self.DingPosition = array.array('d')
+        self.ClickClackTimer.stop()
 
-        self.DingTime = []
-        self.DingPosition = []
-        self.ClickClackTime = 0.0
+        self.LastTick = time.monotonic()
+        self.TickBacklog = 0.0
 
     def BrakeApplyClicked(self): 
         """
@@ -1042,6 +777,22 @@ class Window(QMainWindow, sim_ui4.Ui_MainWindow):
     def closeEvent(self, event):
         sys.exit(0)
 
+    def eventFilter(self, Object, Event):
+        """
+        Watch for the video frame changing size and rescale the background
+
+        :param Object: Object the event is for
+        :param Event: The event
+
+        :returns: False so the event is handled as usual
+        """
+        if ((Object is self.VideoFrame) and (Event.type() == QtCore.QEvent.Resize)):
+            Size = Event.size()
+            self.Background.setGeometry(0, 0, Size.width(), Size.height())
+            self.Background.setPixmap(pixmap_cache.LoadPixmap("background.png").scaled(
+                Size, Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
+        return (super().eventFilter(Object, Event))
+
     ## Not used @@
     def OverspeedMessage(self):
         """
@@ -1063,14 +814,10 @@ class Window(QMainWindow, sim_ui4.Ui_MainWindow):
 
         :param Message: Message to add to the warnings
         """
-        state.Log("Warning %s" % Message)
+        state.Log("Warning %s", Message)
         self.WarningList.append(Message)
-
-        if (len(self.WarningList) < 5):
-            WarningMessage = '\n\n'.join(self.WarningList)
-        else:
-            WarningMessage = '\n\n'.join(self.WarningList[-5:])
-        self.WarningLabel.setText(WarningMessage)
+        self.RecentWarnings.append(Message)
+        self.WarningLabel.setText('\n\n'.join(self.RecentWarnings))
 
     def DisplayWarnings(self):
         """
@@ -1078,48 +825,60 @@ class Window(QMainWindow, sim_ui4.Ui_MainWindow):
         """
         if (len(self.WarningList) == 0):
             return
-        MessageBox = QMessageBox()
-        MessageBox.setIcon(QMessageBox.Critical)
-        MessageBox.setText("<H1 ALIGN=\"CENTER\"><B>You made some mistakes</B></H1>")
-        MessageBox.setWindowTitle("Warnings")
-        Message = "Warning:\n"
-        for Index in range(len(self.WarningList)):
-            Message += "%2d: %s\n" % (Index+1, self.WarningList[Index])
+        Message = "Warning:\n" + "".join("%2d: %s\n" % (Number, Warning) 
+                for Number, Warning in enumerate(self.WarningList, 1))
+        self.ShowMessage("Warnings", Message)
+
+    def ShowMessage(self, Name, Message=None):
+        """
+        Show one of the messages in MESSAGE_BOXES and wait for the user
+
+        :param Name: Name of the message in MESSAGE_BOXES
+        :param Message: Text of the message if the table doesn't have it
+        """
+        Icon, Title, Heading, TableMessage, ButtonText = MESSAGE_BOXES[Name]
+        if (Message is None):
+            Message = TableMessage
+
+        if (self.MessageBox is None):
+            self.MessageBox = QMessageBox(self)
+            self.MessageBox.setStandardButtons(QMessageBox.Ok)
+
+        # The ticks keep going while a message is up, so another
+        # message can come in on top of it.  Don't change the one
+        # the user is reading, give the new message a box of its own.
+        Nested = self.MessageBox.isVisible()
+        if (Nested):
+            MessageBox = QMessageBox(self)
+            MessageBox.setStandardButtons(QMessageBox.Ok)
+        else:
+            MessageBox = self.MessageBox
+
+        MessageBox.setIcon(Icon)
+        MessageBox.setText("<H1 ALIGN=\"CENTER\"><B>%s</B></H1>" % Heading)
+        MessageBox.setWindowTitle(Title)
         MessageBox.setInformativeText(Message)
-        MessageBox.setStandardButtons(QMessageBox.Ok)
-        ButtonOk = MessageBox.button(QMessageBox.Ok)
-        ButtonOk.setText("Continue")
-        ReturnValue = MessageBox.exec()
+        MessageBox.button(QMessageBox.Ok).setText(ButtonText)
+        MessageBox.exec()
+
+        if (Nested):
+            MessageBox.deleteLater()
 
     def ErrorDeadman(self):
         """
         You tried to run without setting the deadman
         """
-        MessageBox = QMessageBox()
-        MessageBox.setIcon(QMessageBox.Critical)
-        MessageBox.setText("<H1 ALIGN=\"CENTER\"><B>Deadman not engaged</B></H1>")
-        MessageBox.setWindowTitle("Deadman not engaged")
-        MessageBox.setInformativeText("""The deadman must be pressed (or clicked) 
-at all times while the trolley is moving.   
-
-If it is released the trolley performs an emergency stop
-""")
-        MessageBox.setStandardButtons(QMessageBox.Ok)
-        ButtonOk = MessageBox.button(QMessageBox.Ok)
-        ButtonOk.setText("Restart")
-        ReturnValue = MessageBox.exec()
+        self.ShowMessage("Deadman")
 
     def SetDirection(self, Direction):
         """
         Change the direction we are going
         """
         if ((state.State.RunLevel != 0) and (Direction != state.DirectionEnum.FORWARD)):
-            state.Log("MediaPlayer: Pause")
-            self.MediaPlayer.pause()
+            self.VideoPause()
             self.ErrorReverserMoved()
             Direction = state.DirectionEnum.FORWARD
-            state.Log("MediaPlayer: Play")
-            self.MediaPlayer.play()
+            self.VideoPlay()
             
         self.ControllerGraphics.SetReverse(Direction)
         self.ControllerButtons.SetReverse(Direction)
@@ -1130,123 +889,51 @@ If it is released the trolley performs an emergency stop
         """
         Display the information message that you completed the course
         """
-        MessageBox = QMessageBox()
-        MessageBox.setIcon(QMessageBox.Information)
-        MessageBox.setText("<H1 ALIGN=\"CENTER\"><B>Congratulations: The run is complete</B></H1>")
-        MessageBox.setWindowTitle("Finished")
-        MessageBox.setInformativeText("""You've made it around the loop.
-
-Press "Restart" to start another run""")
-        MessageBox.setStandardButtons(QMessageBox.Ok)
-        ButtonOk = MessageBox.button(QMessageBox.Ok)
-        ButtonOk.setText("Restart")
-        ReturnValue = MessageBox.exec()
+        self.ShowMessage("Done")
 
     def GoodStop(self):
         """
         The player stopped at the correct position at the store
         """
-        MessageBox = QMessageBox()
-        MessageBox.setIcon(QMessageBox.Information)
-        MessageBox.setText("<H1 ALIGN=\"CENTER\"><B>Congratulations: The run is complete</B></H1>")
-        MessageBox.setWindowTitle("Finished")
-        MessageBox.setInformativeText("""You've made it around the loop.
-
-And you stopped back at the store
-Press "Restart" to start another run""")
-        MessageBox.setStandardButtons(QMessageBox.Ok)
-        ButtonOk = MessageBox.button(QMessageBox.Ok)
-        ButtonOk.setText("Restart")
-        ReturnValue = MessageBox.exec()
+        self.ShowMessage("GoodStop")
 
     def ErrorStart(self):
         """ 
         Handle all the stuff you need at the beginning of an error message
         """
-        state.Log("MediaPlayer.pause()")
-        Result = self.MediaPlayer.pause()
+        self.VideoPause()
         state.State.Acceleration = 0
         state.State.Speed = 0
-        state.Log("Speed %f" % state.State.Speed)
+        state.Log("Speed %f", state.State.Speed)
 
     def ErrorMessageRun4(self):
         """
         Display the error message indicating that we exceeded the run limit
         """
         self.ErrorStart()
-        MessageBox = QMessageBox()
-        MessageBox.setIcon(QMessageBox.Critical)
-        MessageBox.setText("<H1 ALIGN=\"CENTER\"><B>Speed limit exceeded</B></H1>")
-        MessageBox.setWindowTitle("Speed Limit Exceeded")
-        MessageBox.setInformativeText("""This is not a high speed trolley.
-The loop line speed limit is 15mph.
-It is not possible to use the controller at settings "Run-4" or above
-
-Please try again, only slower""")
-        MessageBox.setStandardButtons(QMessageBox.Ok)
-        ButtonOk = MessageBox.button(QMessageBox.Ok)
-        ButtonOk.setText("Restart")
-        ReturnValue = MessageBox.exec()
+        self.ShowMessage("Run4")
 
     def ErrorRunTooLong(self):
         """
         Display the error message when we stay in a run_x too long
         """
         self.ErrorStart()
-        MessageBox = QMessageBox()
-        MessageBox.setIcon(QMessageBox.Critical)
-        MessageBox.setText("<H1 ALIGN=\"CENTER\"><B>Overheated Resisters</B></H1>")
-        MessageBox.setWindowTitle("Overheated Resisters")
-        MessageBox.setInformativeText("""You stayed in Run-%d too long.
-
-The resister pack overheated.  
-
-You can only stay in Run-%d for %d seconds.
-""" % (state.State.RunLevel, state.State.RunLevel, MAX_RUN_TIME))
-        MessageBox.setStandardButtons(QMessageBox.Ok)
-        ButtonOk = MessageBox.button(QMessageBox.Ok)
-        ButtonOk.setText("OK")
-        ReturnValue = MessageBox.exec()
+        self.ShowMessage("RunTooLong", MESSAGE_BOXES["RunTooLong"][3] % \
+            (state.State.RunLevel, state.State.RunLevel, modes.MAX_RUN_TIME))
 
     def ErrorRunTooLongDown(self):
         """
         Display the error message when we stay in a run_x too long on the way down
         """
         self.ErrorStart()
-        MessageBox = QMessageBox()
-        MessageBox.setIcon(QMessageBox.Critical)
-        MessageBox.setText("<H1 ALIGN=\"CENTER\"><B>Electrical Overload</B></H1>")
-        MessageBox.setWindowTitle("Electrical Overload")
-        MessageBox.setInformativeText("""Going from Run-x to idle should be done
-as quickly as possible.   Failure to do so causes the motors to act as
-generators and create feedback which can damage the trolley.
-
-So slam that controller back to idle and avoid this problem.
-""")
-        MessageBox.setStandardButtons(QMessageBox.Ok)
-        ButtonOk = MessageBox.button(QMessageBox.Ok)
-        ButtonOk.setText("OK")
-        ReturnValue = MessageBox.exec()
+        self.ShowMessage("RunTooLongDown")
 
     def ErrorNoForward(self):
         """
         Display the error message we should be in forward before starting
         """
         self.ErrorStart()
-        MessageBox = QMessageBox()
-        MessageBox.setIcon(QMessageBox.Critical)
-        MessageBox.setText("<H1 ALIGN=\"CENTER\"><B>Reverser not set</B></H1>")
-        MessageBox.setWindowTitle("Reverser not set")
-        MessageBox.setInformativeText("""You must select "Forward" on the reverser
-before moving.
-
-Controller has been reset to Run-0
-
-Please set direction and try again.""")
-        MessageBox.setStandardButtons(QMessageBox.Ok)
-        ButtonOk = MessageBox.button(QMessageBox.Ok)
-        ButtonOk.setText("OK")
-        ReturnValue = MessageBox.exec()
+        self.ShowMessage("NoForward")
 
     def ErrorMoveWithBrakesOn(self):
         """
@@ -1254,21 +941,7 @@ Please set direction and try again.""")
         """
         self.ErrorStart()
 
-        MessageBox = QMessageBox()
-        MessageBox.setIcon(QMessageBox.Critical)
-        MessageBox.setText("<H1 ALIGN=\"CENTER\"><B>Attempt to move with brakes set</B></H1>")
-        MessageBox.setWindowTitle("Move with brakes on")
-        MessageBox.setInformativeText("""The brakes and the motor should never be on at the same time.
-
-Set the controller to "Run-0" before applying the brakes.
-Release the brakes before entering "Run-1".
-
-Simulation will now reset.
-""")
-        MessageBox.setStandardButtons(QMessageBox.Ok)
-        ButtonOk = MessageBox.button(QMessageBox.Ok)
-        ButtonOk.setText("OK")
-        ReturnValue = MessageBox.exec()
+        self.ShowMessage("BrakesOn")
 
     def ErrorReverserMoved(self):
         """
@@ -1276,19 +949,7 @@ Simulation will now reset.
         """
         self.ErrorStart()
 
-        MessageBox = QMessageBox()
-        MessageBox.setIcon(QMessageBox.Critical)
-        MessageBox.setText("<H1 ALIGN=\"CENTER\"><B>Reverser moved while car in motion</B></H1>")
-        MessageBox.setWindowTitle("Reverser move while car in motion")
-        MessageBox.setInformativeText("""You cannot change the reverser while the trolley is in motion.
-
-Reverser has been returned to "Forward"
-
-Press OK to continue""")
-        MessageBox.setStandardButtons(QMessageBox.Ok)
-        ButtonOk = MessageBox.button(QMessageBox.Ok)
-        ButtonOk.setText("OK")
-        ReturnValue = MessageBox.exec()
+        self.ShowMessage("ReverserMoved")
 
     def SetRun(self, Level):
         """
@@ -1298,12 +959,12 @@ Press OK to continue""")
 
         :returns: True if we should continue our journey
         """
-        state.Log("SetRun %d" % Level)
+        state.Log("SetRun %d", Level)
         self.ControllerGraphics.SetControllerRun(Level)
         self.ControllerButtons.SetControllerRun(Level)
 
         if (state.State.RunLevel != Level):
-            if (MAX_SPEED[Level] < 0):
+            if (modes.MAX_SPEED[Level] < 0):
                 self.ErrorMessageRun4()
                 self.MainReset()
                 return False
@@ -1311,16 +972,14 @@ Press OK to continue""")
         KeepGoing = self.Mode.ModeSetRun(self, Level)
         
         if (not KeepGoing):
-            state.Log("MediaPlayer: Pause")
-            Result = self.MediaPlayer.pause()
+            self.VideoPause()
             state.State.Acceleration = 0
             state.State.Speed = 0
-            state.Log("Speed %f" % state.State.Speed)
+            state.Log("Speed %f", state.State.Speed)
             return False
 
-        if (self.MediaPlayer.get_state() != vlc.State.Playing):
-            state.Log("MediaPlayer: Play")
-            Result = self.MediaPlayer.play()
+        if (not self.Playing):
+            self.VideoPlay()
 
         state.State.RunLevel = Level
         return (True)
@@ -1341,10 +1000,10 @@ Press OK to continue""")
             if (self.BrakeUi.RedPressure > brake_ui.MAX_RED_PRESSURE):
                 self.BrakeUi.RedPressure = brake_ui.MAX_RED_PRESSURE
             print("DEBUG: 10 pound set %f" % self.BrakeUi.RedPressure)
-            state.Log("DEBUG: 10 pound set %f" % self.BrakeUi.RedPressure)
+            state.Log("DEBUG: 10 pound set %f", self.BrakeUi.RedPressure)
         elif (event.key() == ord('M')):
-            print("Mark Position %.2f" % self.MediaPlayer.get_position())
-            state.Log("Mark Position: %.2f" % self.MediaPlayer.get_position())
+            print("Mark Position %.2f" % self.Position)
+            state.Log("Mark Position: %.2f", self.Position)
         elif ((event.key() >= ord('0')) and (event.key() <= ord('8'))):
             RunLevel = event.key() - ord('0')
             print("DEBUG: Run level %d" % RunLevel)
@@ -0,0 +1,717 @@
+#
+# Copyright 2024 by Steve Oualline
+# Licensed under the GNU Public License (GPL)
+#
+"""
+The simulator modes (easy, start/stop, full) and the physics they use
+"""
+import bisect
+import functools
+import time
+
+import state
+import sound
+
+#----------------------------------------------------------------
+# Physics section
+#
+# Speed is measured in playback rate.  1.0 is normal playback speed
+# Run1 at full speed is 1.5
+# Run2 at full speed is 2.0
+# Run3 at full speed is 2.5
+#
+# These speeds are based on the speed of the video and have no scientific
+# justification.
+#
+# Acceleration is defined A=VT. V is defined by MAX_SPEED.
+# The time to reach full speed is set to SPEED_TIME or 6 seconds.
+# (Again an estimation)
+#----------------------------------------------------------------
+MIN_SPEED=0.5   # Vlc won't move at lower speeds
+#            0    1    2    3    4     5     6     7      8
+MAX_SPEED = (0.5, 1.5, 2.0, 2.5, -1.0, -1.0, -1.0, -1.0, -1.0)
+SPEED_TIME = 6  # Number of seconds it takes to get to full speed.
+
+FRICTION=0.99995   # Friction is 0.005% of the current speed
+
+MAX_RUN_TIME=10 # Longest we can run in anything but full series or full parallel
+MAX_DOWN_TIME=1 # Longest we can stay in a run level going down
+
+# Signal section
+MAX_SIGNAL_START=10     # You must move within 10 seconds of issuing start signal
+MAX_START_BETWEEN=2     # The ding ding that starts must occur within 2 seconds
+STOP_TIME_CHECK=10      # Check stop signal 10 seconds after stop
+STOP_SIGNAL_TIME=2      # Must have two seconds before stop to avoid confusion
+
+STORE_POSITION=0.95     # Beginning of the store
+
+PHYSICS_STEP = 0.1      # Seconds of simulated time per physics update
+
+
+CENTRAL_BELL_START = 0.36       # Location to start sounding central bell
+CENTRAL_BELL_STOP = 0.45        # Location to stop sounding central bell
+
+# Acceleration for each run level, computed once.  Entry N is the
+# acceleration to go from the speed of run level N-1 to that of run level N.
+ACCEL_TABLE = tuple((MAX_SPEED[Level] - MAX_SPEED[Level-1]) / SPEED_TIME
+                    for Level in range(len(MAX_SPEED)))
+
+def Integrate(Speed, Acceleration, BrakeAcceleration, MaxSpeed):
+    """
+    Advance the speed by one physics step
+
+    :param Speed: Current speed
+    :param Acceleration: Acceleration from the controller
+    :param BrakeAcceleration: Acceleration (negative) from the brakes
+    :param MaxSpeed: Top speed for the current run level
+    :returns: (Speed, Acceleration) after the step
+    """
+    # Increase speed based on acceleration, then apply friction
+    Speed = (Speed + (Acceleration + BrakeAcceleration) * PHYSICS_STEP) * FRICTION
+
+    # Brakes can stop us, but not push us backwards
+    if (Speed < 0):
+        Speed = 0
+
+    # Stop accelerating once we reach the top speed for this run level
+    if ((Acceleration > 0) and (Speed > MaxSpeed)):
+        Speed = MaxSpeed
+        Acceleration = 0
+
+    return (Speed, Acceleration)
+
+class PositionWatcher:
+    """
+    Calls an action once as the video passes each of a set of positions.
+
+    Fed from the VLC position changed events, so all it has to do on
+    each event is look at the next position we have not reached yet.
+    """
+    # Fixed set of attributes, no per instance dictionary
+    __slots__ = ('Positions', 'Actions', 'Next')
+
+    def __init__(self, Thresholds):
+        """
+        :param Thresholds: List of (Position, Action).  Action is called
+            as Action(MainWindow) when we reach Position.
+        """
+        Thresholds = sorted(Thresholds, key=lambda Threshold: Threshold[0])
+        self.Positions = [Threshold[0] for Threshold in Thresholds]
+        self.Actions = [Threshold[1] for Threshold in Thresholds]
+        self.Next = 0           # Index of the next position to reach
+
+    def Update(self, MainWindow, Position):
+        """
+        The video has moved.  Call the actions for everything we just passed
+
+        :param MainWindow: The main window
+        :param Position: The new video position
+        """
+        # One binary search tells us how many positions we have passed.
+        # Most of the time it's none and we are done.
+        Reached = bisect.bisect_right(self.Positions, Position, self.Next)
+        if (Reached == self.Next):
+            return
+        Passed = self.Actions[self.Next:Reached]
+        self.Next = Reached
+        for Action in Passed:
+            Action(MainWindow)
+
+def CentralBellStart(MainWindow):
+    """
+    We've reached the center of town, start the central bell
+
+    :param MainWindow: The main window
+    """
+    sound.PlaySound.Play(sound.SoundEnum.CENTRAL_BELL, True)
+
+def CentralBellStop(MainWindow):
+    """
+    We've left the center of town, stop the central bell
+
+    :param MainWindow: The main window
+    """
+    sound.PlaySound.Stop(sound.SoundEnum.CENTRAL_BELL)
+
+# Positions where every mode has something to do
+CENTRAL_BELL_THRESHOLDS = ((CENTRAL_BELL_START, CentralBellStart), 
+                           (CENTRAL_BELL_STOP, CentralBellStop))
+
+class EasyMode:
+    Name = "Easy Mode"
+    """
+    Class that defines the easy mode of operation.
+
+    In this mode you can press Run0, Run1, Run2. 
+    Run0 will brake the trolley until it stops.
+    Run1 will accelerate to the Run1 speed.  If you are faster that that it brakes.
+    Run2 will accelerate to the Run2 speed.  If you are faster that that we have an internal error
+    """
+    # Fixed set of attributes, no per instance dictionary
+    __slots__ = ('SlowDownAcceleration', 'MaxSpeed', 'Watcher')
+
+    def __init__(self):                 # EasyMode
+        # The deacceleration speed
+        self.SlowDownAcceleration = -0.5
+
+    """
+    Mode where you move by setting Run-1 and Run-2.  
+    Moving the controller back will slow you down.
+
+    :param: MainWindow -- The main window
+    """
+    def ModeSetRun(self, MainWindow, RunLevel):         # Easymode
+        """
+        Set the run level
+
+        :param MainWindow: The Top level window
+        :param RunLevel: RunLevel to set
+        """
+        state.Log("Runlevel Old %d New %d", state.State.RunLevel, RunLevel)
+        # First do nothing if the run level does not change
+        if (RunLevel == state.State.RunLevel):
+            return (True)
+
+        # Find the maximum speed
+        self.MaxSpeed = MAX_SPEED[RunLevel]
+
+        # Run0 has special speed
+        if (RunLevel == 0):
+            self.MaxSpeed = 0
+
+        # Don't let us fall below the minimum
+        # VLC don't really move right with speeds from 0 to 0.5
+        if (RunLevel > 0) and (state.State.Speed < MIN_SPEED):
+            state.State.Speed = MIN_SPEED
+            state.Log("Speed %f", state.State.Speed)
+
+        # Decide what type of acceleration we need
+        if (state.State.Speed > self.MaxSpeed):
+            state.State.Acceleration = self.SlowDownAcceleration
+            state.Log("Acceleration %1.3f", state.State.Acceleration)
+        else:
+            state.State.Acceleration = ACCEL_TABLE[RunLevel]
+            state.Log("Acceleration %1.3f", state.State.Acceleration)
+        return True
+
+    def ModeReset(self):                    # EasyMode
+        """
+        Called to reset the mode
+
+        """
+        self.MaxSpeed = 0
+        state.State.Reset()
+        self.Watcher = PositionWatcher(self.Thresholds())
+
+    def Thresholds(self):                   # EasyMode
+        """
+        :returns: List of (Position, Action) for the position watcher
+        """
+        return (list(CENTRAL_BELL_THRESHOLDS))
+
+    def ModeUpdate(self, MainWindow):                   # EasyMode
+        """
+        Return the updated speed
+
+        :param MainWindow: The main window
+        """
+
+        State = state.State
+        Speed = State.Speed
+        Acceleration = State.Acceleration
+
+        # Increase speed based on acceleration 
+        Speed += (Acceleration * PHYSICS_STEP)
+        state.Log("Speed %1.3f", Speed)
+
+        if (Acceleration > 0):
+            if (Speed > self.MaxSpeed):
+                Acceleration = 0
+                Speed = self.MaxSpeed
+                state.Log("Speed %1.3f", Speed)
+        else:
+            if (Speed < 0):
+                Acceleration = 0
+                Speed = 0
+                state.Log("Speed %1.3f", Speed)
+
+        State.Speed = Speed
+        State.Acceleration = Acceleration
+
+    def RulesCheck(self, MainWindow):   # EasyMode
+        """
+        Check to see if we violated any of the rules
+
+        :param MainWindow: Top level window
+
+        :returns: True if it's safe to contine
+        """
+        if (not state.State.Deadman) and ((state.State.Speed != 0) or (state.State.RunLevel != 0)):
+            MainWindow.VideoPause()
+            MainWindow.ErrorDeadman()
+            MainWindow.MainReset()
+            return False
+        return True
+
+class StartStopMode:
+    """
+    Mode where you move by setting Run-1 and Run-2.  
+    Moviing the controller back does nothing.
+
+    Brakes work.
+    """
+    Name = "Start/Stop Mode"
+    # Fixed set of attributes, no per instance dictionary
+    __slots__ = ('MaxSpeed', 'LastRunLevel', 'RunLevelTime', 'Watcher')
+
+    def ModeSetRun(self, MainWindow, RunLevel):         # StartStopMode
+        """
+        Set the run level
+
+        :param MainWindow: Main window
+        :param RunLevel: Run level selected
+
+        :returns: True if we should contine, false if should reset
+        """
+        # Nothing to do if the run level does not change.  (MaxSpeed
+        # only changes with the run level, so the speed check below
+        # can't find anything either.)
+        if (state.State.RunLevel == RunLevel):
+            return (True)
+
+        # The RunLevel has changed
+        self.LastRunLevel = state.State.RunLevel
+        self.RunLevelTime = time.monotonic()
+        # Now we need to check if we've exceeded the limits on run level
+        # If so, we will error out and stop the simulation
+        if (MAX_SPEED[RunLevel] < 0):
+            MainWindow.ErrorMessageRun4()
+            return False
+
+        # Run level is acceptable.
+        # Now we need to decide if we need to accelerate.
+        # If we are moving, then we compute the acceleration in (video speed/tick)
+        # by checking how much it takes to go from one run speed to another in the
+        # time needed to reach maximum speed
+        if (RunLevel != 0):
+            state.State.Acceleration = ACCEL_TABLE[RunLevel]
+            state.Log("Acceleration %1.3f", state.State.Acceleration)
+
+            # Save off the maximum speed for this run level
+            self.MaxSpeed = MAX_SPEED[RunLevel]
+        else:
+            # We are run level 0.  So we coast (as far as the motor is concerned)
+            # The brake will play with this number later
+            state.State.Acceleration = 0
+            state.Log("Acceleration %1.3f", state.State.Acceleration)
+
+        if (self.MaxSpeed < state.State.Speed):
+            state.State.Acceleration = 0
+            state.Log("Acceleration %1.3f", state.State.Acceleration)
+            state.State.Speed = self.MaxSpeed
+            state.Log("Speed %1.3f", state.State.Speed)
+            
+        state.Log("StartStopMode: SetRunLevel %d Acceleration %1.3f", RunLevel, state.State.Acceleration)
+        return (True)
+
+    def ModeReset(self):            # StartStopMode
+        """
+        Called to reset the mode
+
+        """
+        state.State.Reset()
+        self.MaxSpeed = 0
+        self.LastRunLevel = 0
+        self.Watcher = PositionWatcher(self.Thresholds())
+
+    def Thresholds(self):                   # StartStopMode
+        """
+        :returns: List of (Position, Action) for the position watcher
+        """
+        return (list(CENTRAL_BELL_THRESHOLDS))
+
+    def ModeUpdate(self, MainWindow):           # StartStopMode
+        """
+        Return the updated speed
+
+        :param MainWindow: Main window
+        """
+
+        State = state.State
+        BrakeAcceleration = State.BrakeAcceleration
+        Speed, Acceleration = Integrate(State.Speed, State.Acceleration,
+                BrakeAcceleration, self.MaxSpeed)
+        State.Speed = Speed
+        State.Acceleration = Acceleration
+        state.Log("Speed %f Acceleration %s BrakeAcceleration: %s",
+                Speed, Acceleration, BrakeAcceleration)
+
+
+    def RulesCheck(self, MainWindow):   # Start stop mode
+        """
+        Check to see if we violated any of the rules
+
+        :param MainWindow: Top level window
+
+        :returns: True if it's safe to contine
+        """
+        State = state.State
+        RunLevel = State.RunLevel
+
+        # The deadman must be pressed if we are moving or trying to run
+        if (not State.Deadman) and \
+            ((State.Speed != 0) or (RunLevel != 0)):
+            state.Log("StartStop: Deadman %d %f %d",
+                 State.Deadman, State.Speed, RunLevel)
+            MainWindow.ErrorDeadman()
+            MainWindow.MainReset()
+            return False
+
+        # Everything else only matters if we are trying to run
+        if (RunLevel == 0):
+            return True
+
+        # If we are moving or trying to the brake must be released
+        if (State.BrakeValvePosition != state.BrakeEnum.RELEASE):
+            MainWindow.ErrorMoveWithBrakesOn()
+            MainWindow.MainReset()
+            return False
+
+        # We are only allowed to move in the forward direction
+        if (State.Direction != state.DirectionEnum.FORWARD):
+            MainWindow.ErrorNoForward()
+            MainWindow.MainReset()
+            return False
+
+        # Get the time of the last element of the run info file
+        TimeDiff = time.monotonic() - self.RunLevelTime
+
+        if (RunLevel > self.LastRunLevel):
+            if (TimeDiff > MAX_RUN_TIME):
+                MainWindow.ErrorRunTooLong()
+                MainWindow.MainReset()
+                return (False)
+        else:
+            if (TimeDiff > MAX_DOWN_TIME):
+                MainWindow.ErrorRunTooLongDown()
+                MainWindow.MainReset()
+                return (False)
+
+        return True
+
+class FullMode(StartStopMode):
+    """
+    Make sure we follow all the rules.
+
+    Rules:
+        1. Two dings before each start
+        2. One ding after stop.
+        3. Stop at broadway
+        4. Sound bell when crossing.
+        5. Sound bell when crossing center.
+        6. Stop at CB4
+        7. No power at Zorch point / broadway spur
+        8. Bell crossing broadway
+        9. No power at Zorch point / main spur
+        10. Stop at thomas
+        11. Stop at store
+    """
+
+    ########
+    ######## Stop information
+    ########
+    BROADWAY_STOP_BEGIN=0.09        # Position of the start of where can do a Broadway stop
+    BROADWAY_STOP_END=0.12          # Position of the end of where can do a Broadway stop
+    BROADWAY_STOP_CHECK=0.15        # Position of where we check to see if Broadway stop done
+    ##@@ REmove above
+
+    CB4_STOP_BEGIN=0.58             # Position of the start of where can do a CB4 stop
+    CB4_STOP_END=0.61               # Position of the end of where can do a CB4 stop
+
+    ##@@ Make real
+    THOMAS_STOP_BEGIN=0.87           # Position of the start of the Thomas stop
+    THOMAS_STOP_END=0.93             # Position of the end of the Thomas stop
+
+    STOP_CHECKS_START = (BROADWAY_STOP_BEGIN, CB4_STOP_BEGIN, THOMAS_STOP_BEGIN)
+    STOP_CHECKS_END =   (BROADWAY_STOP_END,   CB4_STOP_END,   THOMAS_STOP_BEGIN)
+    STOP_MESSAGE    =   ("Broadway",          "Carbarn 2",    "Thomas")
+
+    ########
+    ######## Crossing information
+    ########
+    BROADWAY_NORTH_BEGIN=0.12       # Position where we start crossing Broadway
+    BROADWAY_NORTH_END=0.15         # Position where we stop crossing Broadway
+    
+    CENTRAL_BEGIN=0.39              # Where we start crossing Central Ave.
+    CENTRAL_END=0.42                # Where we start crossing Central Ave.
+
+    BROADWAY_SOUTH_BEGIN=0.70       # Position where we start crossing Broadway (South)
+    BROADWAY_SOUTH_END=0.75         # Position where we stop crossing Broadway (South)
+
+    CROSSING_START   = (BROADWAY_NORTH_BEGIN, CENTRAL_BEGIN, BROADWAY_SOUTH_END)
+    CROSSING_END     = (BROADWAY_NORTH_END,   CENTRAL_END,   BROADWAY_SOUTH_END)
+    CROSSING_MESSAGE = ("Broadway north",     "Central",     "Broadway South")
+
+    CROSSING_DING_COUNT=3           # Number of dings needed at each crossing
+
+    ########
+    ######## Zorch information
+    ########
+    ZORCH1_POS_START=0.70                 # Zorch position 1 start
+    ZORCH2_POS_START=0.77                 # Zorch position 2 start
+    ZORCH1_POS_END=0.73                   # Zorch position 1 ending
+    ZORCH2_POS_END=0.79                   # Zorch position 2 ending
+
+    ZORCH_START   = (ZORCH1_POS_START, ZORCH2_POS_START)
+    ZORCH_END     = (ZORCH1_POS_END,   ZORCH2_POS_END)
+    ZORCH_MESSAGE = ("Carbarn1 lead", "Main line spur")
+
+    Name = "Full Mode"
+    # Only the attributes StartStopMode does not already have
+    __slots__ = ('LastSpeed', 'CurrentSpeed', 'Started', 'Stopped', 'StopTime', 
+                 'ActiveStops', 'ActiveZorches', 'AtStore', 'ZorchDone')
+
+    def ModeReset(self):            # FullMode
+        """
+        Called to reset the mode
+
+        """
+        super().ModeReset()
+        # These two variables are used to detect starts and stops
+        self.LastSpeed = 0              # The speed before this one
+        self.CurrentSpeed = 0           # The speed we have now
+        # A tick can have several physics steps (or none), so the
+        # steps note the starts and stops for the next rules check
+        self.Started = False            # Went from stopped to moving
+        self.Stopped = False            # Went from moving to stopped
+
+        self.StopTime = 0               # Time of last stop is old
+
+        # The position watcher keeps track of where we are.
+        self.ActiveStops = []           # Stops we are in and have not made
+        self.ActiveZorches = []         # Zorch points we are in
+        self.AtStore = False            # Have we reached the store
+        self.ZorchDone = [False, False]                 # Did we do a zorch
+
+    def Thresholds(self):                   # FullMode
+        """
+        :returns: List of (Position, Action) for the position watcher
+        """
+        Thresholds = super().Thresholds()
+        # Where two positions are the same, the one added first goes
+        # first, so the starts of the windows go in before the ends.
+        for Index in range(len(self.STOP_CHECKS_START)):
+            Thresholds.append((self.STOP_CHECKS_START[Index], 
+                functools.partial(self.StopEnter, Index=Index)))
+        for Index in range(len(self.ZORCH_START)):
+            Thresholds.append((self.ZORCH_START[Index], 
+                functools.partial(self.ZorchEnter, Index=Index)))
+
+        for Index in range(len(self.CROSSING_END)):
+            Thresholds.append((self.CROSSING_END[Index], 
+                functools.partial(self.CrossingCheck, Index=Index)))
+        for Index in range(len(self.STOP_CHECKS_END)):
+            Thresholds.append((self.STOP_CHECKS_END[Index], 
+                functools.partial(self.StopMissed, Index=Index)))
+        for Index in range(len(self.ZORCH_END)):
+            Thresholds.append((self.ZORCH_END[Index], 
+                functools.partial(self.ZorchLeave, Index=Index)))
+
+        Thresholds.append((STORE_POSITION, self.StoreReached))
+        return (Thresholds)
+
+    def StopEnter(self, MainWindow, Index):
+        """
+        We've reached the start of a stop
+
+        :param MainWindow: The main window
+        :param Index: Which stop
+        """
+        self.ActiveStops.append(Index)
+
+    def ZorchEnter(self, MainWindow, Index):
+        """
+        We've reached the start of a zorch point
+
+        :param MainWindow: The main window
+        :param Index: Which zorch point
+        """
+        self.ActiveZorches.append(Index)
+
+    def ZorchLeave(self, MainWindow, Index):
+        """
+        We've gone past a zorch point
+
+        :param MainWindow: The main window
+        :param Index: Which zorch point
+        """
+        self.ActiveZorches.remove(Index)
+
+    def StoreReached(self, MainWindow):
+        """
+        We've reached the store
+
+        :param MainWindow: The main window
+        """
+        self.AtStore = True
+
+    def CrossingCheck(self, MainWindow, Index):
+        """
+        We've passed a crossing.  Did we sound the bell
+
+        :param MainWindow: The main window
+        :param Index: Which crossing
+        """
+        # Get the number of times we dinged here
+        DingDingDing = self.DingCount(MainWindow.DingPosition, 
+            self.CROSSING_START[Index], self.CROSSING_END[Index])
+
+        if (DingDingDing < self.CROSSING_DING_COUNT):
+            MainWindow.AddWarning("Failed to sound bell crossing %s" % self.CROSSING_MESSAGE[Index])
+
+    def StopMissed(self, MainWindow, Index):
+        """
+        We've passed the end of a stop.  Did we stop
+
+        :param MainWindow: The main window
+        :param Index: Which stop
+        """
+        if (Index in self.ActiveStops):
+            self.ActiveStops.remove(Index)
+            MainWindow.AddWarning("Failed stop at %s" % self.STOP_MESSAGE[Index])
+
+    def ModeUpdate(self, MainWindow):           # FullMode
+        """
+        Return the updated speed
+
+        :param MainWindow: Main window
+        """
+        super().ModeUpdate(MainWindow)
+        self.LastSpeed = self.CurrentSpeed
+        self.CurrentSpeed = state.State.Speed
+        if ((self.LastSpeed == 0) and (self.CurrentSpeed != 0)):
+            self.Started = True
+        elif ((self.LastSpeed != 0) and (self.CurrentSpeed == 0)):
+            self.Stopped = True
+
+    def DingCount(self, DingPosition, Start, End):
+        """
+        Return the number of dings in the interval
+
+        :param DingPosition: Array of ding positions (sorted)
+        :param Start: When to start counting
+        :param End: When to stop counting
+
+        :returns: Number of dings seen
+        """
+        return (bisect.bisect_right(DingPosition, End) - bisect.bisect_left(DingPosition, Start))
+
+    def CheckStartStopDing(self, MainWindow):
+        """
+        Checks to see if we started or stopped and did 
+        the dings correctly
+
+        :param MainWindow: The main window
+
+        Notes:
+            DingTime -- When we did the last two dings
+
+        """
+        # Take one look at the clock and the ding list for the whole check
+        Now = time.monotonic()
+        DingTime = MainWindow.DingTime
+        DingLen = len(DingTime)
+        LastDingTime = DingTime[-1] if (DingLen > 0) else 0.0   # Most recent ding
+        PrevDingTime = DingTime[-2] if (DingLen > 1) else 0.0   # The one before that
+
+        # See if we went from stopped to moving
+        if (self.Started):
+            self.Started = False
+            # Now check to see if the operator did ding-ding before moving
+            # There must be two dings in the last 10 seconds
+            # and they must be less than 2 seconds apart
+
+            # Do we have two dings
+            if (DingLen < 2):
+                MainWindow.AddWarning("Started moving without sounding start signal")
+            else:
+                # Current time 1000 Ding time 999 Good=true
+                # Current time 1000 Ding time 900 Good=false
+
+                # Did we signal within the last 10 seconds
+                if (Now - PrevDingTime > MAX_SIGNAL_START):
+                    MainWindow.AddWarning("Started moving without sounding start signal")
+                # Are the ding ding more than 2 seconds apart
+                elif ((LastDingTime - PrevDingTime) > MAX_START_BETWEEN):
+                    MainWindow.AddWarning("Start signal is ding-ding not ding-wait-ding")
+
+        # Did we ding after stopping
+        if ((DingLen > 0) and (LastDingTime >= self.StopTime)):
+            LastDing = LastDingTime
+        else:
+            LastDing = 0
+
+        if (self.StopTime != 0) and \
+            ((Now - self.StopTime >= STOP_TIME_CHECK) or (LastDing > self.StopTime)):
+            # There should be one ding in the last second
+
+            # Check to see if signal missed
+            if (DingLen == 0):
+                MainWindow.AddWarning("No stop signal")
+            else:
+                # Check to see if single ding.  (Occurs when start signal missed)
+                if ((Now - LastDingTime) > STOP_SIGNAL_TIME):
+                    MainWindow.AddWarning("Stop Signal too slow or missing")
+                elif (DingLen > 1):
+                    if ((LastDingTime - PrevDingTime) < STOP_SIGNAL_TIME):
+                        MainWindow.AddWarning("Stop Signal confused with other signals")
+
+            self.StopTime = 0   # We've looked at this so clear it
+
+        if (self.Stopped):
+            self.Stopped = False
+            self.StopTime = Now
+
+    def RulesCheck(self, MainWindow):   # Full mode
+        """
+        Check to see if we violated any of the rules
+
+        :param MainWindow: Top level window
+
+        :returns: True if it's safe to continue
+        """
+        Continue = super().RulesCheck(MainWindow)
+        if (not Continue):
+            return (Continue)
+
+        self.CheckStartStopDing(MainWindow)
+
+        Position = MainWindow.Position
+        State = state.State
+
+        # Did we make a stop.  Going past a stop without stopping 
+        # is caught by the position watcher.
+        if (self.CurrentSpeed == 0):
+            for Index in self.ActiveStops:
+                state.Log("Setting Stop for %s", self.STOP_MESSAGE[Index])
+            self.ActiveStops.clear()
+
+        # Check Zorching
+        Zorching = False
+        if (self.ActiveZorches and (State.RunLevel != 0)):
+            Zorching = True
+            state.Log("Zorch at position %0.2f", Position)
+            for Index in self.ActiveZorches:
+                if (not self.ZorchDone[Index]):
+                    MainWindow.AddWarning("Zorched %s" % self.ZORCH_MESSAGE[Index])
+                    self.ZorchDone[Index] = True
+        sound.PlaySound.Want(sound.SoundEnum.ZORCH, Zorching)
+
+        if (self.AtStore and (State.Speed == 0)):
+            state.Log("Stopped correctly at store")
+            MainWindow.DisplayWarnings()
+            MainWindow.GoodStop();
+            MainWindow.MainReset()
+            return (False)
+
+        return True
@@ -0,0 +1,37 @@
+#
+# Copyright 2024 by Steve Oualline
+# Licensed under the GNU Public License (GPL)
+#
+"""
+Load the images in the image directory once and keep them around
+"""
+import os
+
+from PyQt5.QtGui import QPixmap
+
+PixmapCache = {}        # (Name, Width, Height) -> QPixmap
+
+def LoadPixmap(Name, Width=None, Height=None):
+    """
+    Load an image from the image directory, scaled if asked.
+
+    The result is remembered, so asking for the same image at the
+    same size again does not decode or scale anything.
+
+    :param Name: File name in the image directory
+    :param Width: If given, scale to this width
+    :param Height: If given, scale to this height
+
+    :returns: The pixmap
+    """
+    Key = (Name, Width, Height)
+    Pixmap = PixmapCache.get(Key)
+    if (Pixmap is None):
+        if (Width is not None):
+            Pixmap = LoadPixmap(Name).scaledToWidth(Width)
+        elif (Height is not None):
+            Pixmap = LoadPixmap(Name).scaledToHeight(Height)
+        else:
+            Pixmap = QPixmap(os.path.join("image", Name))
+        PixmapCache[Key] = Pixmap
+    return (Pixmap)
@@ -3,6 +3,7 @@ Handle all sound related activities
 """
 import vlc
 import enum
+import collections
 import state
 
 PlaySound = None        # The sound playing class (signleton)
@@ -21,6 +22,9 @@ class SoundEnum(enum.IntEnum):
     CENTRAL_BELL = 9,
     ZORCH = 10
 
+# The RunningMask bits of the bells.  Ding rings the first one that's free.
+BELL_BITS = (1 << SoundEnum.BELL1) | (1 << SoundEnum.BELL2) | (1 << SoundEnum.BELL3)
+
 def SoundEventHandler(Event, PlayerClass, Index):
     """
     Handle a sound end event.
@@ -29,12 +33,13 @@ def SoundEventHandler(Event, PlayerClass, Index):
     PlayerClass -- The player singleton
     Index -- Sound that stopped us
     """
-    PlayerClass.Players[Index] = None
-    PlayerClass.Running[Index] = False
-    PlayerClass.Stop(Index)
-    if (PlayerClass.Repeat[Index]):
-        state.Log("Sound %r Repeat %r" % (SoundEnum(Index), Repeat))
-        PlayerClass.Play(Index, True);
+    # This runs in a VLC thread.  We can't stop or restart the
+    # player from inside its own event, and the GUI thread owns
+    # RunningMask, so just queue it up for EndsProcess and ask
+    # for it to be run on the GUI thread now.
+    PlayerClass.Ended.append(Index)
+    if (PlayerClass.EndNotify is not None):
+        PlayerClass.EndNotify()
 
 class PlaySoundClass:
     def __init__(self):
@@ -55,14 +60,38 @@ class PlaySoundClass:
                 "central-bell.mp3",     # 9
                 "electric-155027.mp3"   # 10 (zorch)
                 )
+        self.Instance = vlc.Instance()
+
+        # Make all the players now so the first play of a sound
+        # doesn't have to wait for VLC to open the file.  Sounds
+        # with the same file (the bells) share one Media.
+        Medias = {}             # File -> Media
         self.Players = []
         self.Repeat = []
-        self.Running = []
-        for Index in range(len(self.SoundFiles)):
+        self.RunningMask = 0    # Bit (1 << Sound) is set while Sound is playing
+        self.Ended = collections.deque()        # Sounds that have ended (from VLC)
+        # Called (from the VLC thread) when a sound ends so EndsProcess
+        # can be run without waiting for the next tick
+        self.EndNotify = None
+        for Sound, SoundFile in zip(SoundEnum, self.SoundFiles):
             self.Repeat.append(False)
-            self.Running.append(False)
-            self.Players.append(None)
-        self.Instance = vlc.Instance()
+            if (Sound == SoundEnum.NOT_USED):
+                self.Players.append(None)
+                continue
+
+            if (SoundFile not in Medias):
+                Medias[SoundFile] = self.Instance.media_new(SoundFile)
+
+            Player = self.Instance.media_player_new()
+            Player.set_media(Medias[SoundFile])
+            Player.audio_set_mute(False)
+            Player.audio_set_volume(100)
+            Player.event_manager().event_attach(
+                vlc.EventType.MediaPlayerEndReached, SoundEventHandler, self, Sound) 
+            self.Players.append(Player)
+
+        # Sounds asked for with Want.  Sound -> (On, Repeat)
+        self.Wanted = {}
 
     def Play(self, Sound, Repeat):
         """
@@ -72,25 +101,20 @@ class PlaySoundClass:
             Sound -- Sound to play enum
             Repeat -- If true, play forever
         """
-        state.Log("Start Sound %s Repeat %r Running %r" % (Sound.name, Repeat, self.Running[Sound]))
-        if (self.Running[Sound]):
+        self.EndsProcess()
+        Bit = 1 << Sound
+        state.Log("Start Sound %s Repeat %r Running %r", Sound.name, Repeat, bool(self.RunningMask & Bit))
+        if (self.RunningMask & Bit):
             return
 
-        if (self.Players[Sound] is None):
-            Media = self.Instance.media_new(self.SoundFiles[Sound])
-
-            self.Players[Sound] = self.Instance.media_player_new()
-            self.Players[Sound].set_media(Media)
-            self.Players[Sound].audio_set_mute(False)
-            self.Players[Sound].audio_set_volume(100)
-            self.Players[Sound].event_manager().event_attach(
-                vlc.EventType.MediaPlayerEndReached, SoundEventHandler, self, Sound) 
-
-        self.Running[Sound] = True
+        self.RunningMask |= Bit
         self.Repeat[Sound] = Repeat
 
-        self.Players[Sound].set_position(0)
-        self.Players[Sound].play()
+        # A player that reached the end must be stopped before it
+        # will play again.  This also puts it back at the start.
+        Player = self.Players[Sound]
+        Player.stop()
+        Player.play()
 
     def Stop(self, Sound):
         """
@@ -99,12 +123,62 @@ class PlaySoundClass:
         Parameters
              Sound -- Sound to stop enum
         """
-        state.Log("Stop Sound %s" % Sound.name)
+        state.Log("Stop Sound %s", Sound.name)
         if (self.Players[Sound] is not None):
             self.Players[Sound].stop()
-        self.Players[Sound] = None
         self.Repeat[Sound] = False
-        self.Running[Sound] = False
+        self.RunningMask &= ~(1 << Sound)
+
+    def EndsProcess(self):
+        """
+        Handle the sounds VLC told us have ended.  They are no longer
+        running and the repeating ones are started again.
+        """
+        while (self.Ended):
+            Sound = SoundEnum(self.Ended.popleft())
+            self.RunningMask &= ~(1 << Sound)
+            Repeat = self.Repeat[Sound]
+            if (Repeat):
+                state.Log("Sound %r Repeat %r", Sound, Repeat)
+                self.Play(Sound, True)
+
+    def Want(self, Sound, On, Repeat=False):
+        """
+        Say whether a sound should be going.  Nothing is started
+        or stopped until Reconcile, so this can be called every 
+        tick without touching the players.
+
+        Parameters
+            Sound -- Sound enum
+            On -- True if the sound should be playing
+            Repeat -- If true, it's a looping sound and is stopped
+                      when no longer wanted.  Other sounds are
+                      allowed to finish.
+        """
+        self.Wanted[Sound] = (On, Repeat)
+
+    def Reconcile(self):
+        """
+        Start or stop the sounds given to Want so they match
+        what was asked for.   Called once per tick.
+        Repeating sounds that ended are started again here.
+        """
+        self.EndsProcess()
+        for Sound, (On, Repeat) in self.Wanted.items():
+            if (On):
+                if (not (self.RunningMask & (1 << Sound))):
+                    self.Play(Sound, Repeat)
+            elif (Repeat and (self.RunningMask & (1 << Sound))):
+                self.Stop(Sound)
+
+    def Reset(self):
+        """
+        Turn off everything given to Want
+        """
+        for Sound, (On, Repeat) in self.Wanted.items():
+            self.Wanted[Sound] = (False, Repeat)
+        self.Reconcile()
+        self.Wanted.clear()
 
 def Init():
     """ 
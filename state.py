@@ -3,13 +3,15 @@
 # Licensed under the GNU Public License (GPL)
 #
 import enum
-import inspect
-import pathlib
-import datetime
+import logging
+import logging.handlers
+import time
 import platform
 import sys
 import os
 
+SYSTEM = platform.system()     # The operating system we are running on
+
 class DirectionEnum(enum.Enum):
     FORWARD = 0         # Direction is forward
     NEUTRAL = 1         # Direction is neutral
@@ -33,6 +35,10 @@ class TrolleyState:
     Speed -- Current speed
     Acceleration -- Current acceleration
     """
+    # Fixed set of attributes, no per instance dictionary
+    __slots__ = ('BrakeValve', 'RunLevel', 'Reverser', 'Deadman', 'Direction',
+                 'Speed', 'Acceleration', 'BrakeAcceleration', 'BrakeValvePosition')
+
     def Reset(self):
         self.BrakeValve = BrakeEnum.APPLY  # Brake valve position
         self.RunLevel = 0       # Current run level
@@ -50,33 +56,82 @@ def Init():
     """
     global State
     State = TrolleyState()
+    LogSetup()
+
+# All logging goes through the "trolley" logger.  Log is its debug
+# method, so call it as Log(Format, Args...) and the formatting is only
+# done if the level lets the message through.  The log is on by default,
+# set the level to logging.INFO to turn it off, or set TROLLEY_NOLOG
+# in the environment to turn it off completely.
+LOG_BUFFER_LINES = 200  # Log lines to hold before writing them out
+
+Logger = logging.getLogger("trolley")
+Logger.setLevel(logging.DEBUG)
+Log = Logger.debug
+
+class LogFormatter(logging.Formatter):
+    """
+    Log formatter that only works out the date and time text once a second
+    """
+    def __init__(self, Format):
+        super().__init__(Format)
+        self.LastSecond = None  # The second we last formatted
+        self.LastText = ""      # The text for that second
 
-LogFile = None          # File to log to
+    def formatTime(self, Record, DateFormat=None):
+        Second = int(Record.created)
+        if (Second != self.LastSecond):
+            self.LastSecond = Second
+            self.LastText = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(Second))
+        return ("%s,%03d" % (self.LastText, Record.msecs))
 
-def Log(Message):
+def LogFlush():
     """
-    Write a message to the log file
+    Write out anything waiting in the log buffer
+    """
+    for Handler in Logger.handlers:
+        Handler.flush()
+
+def LogNothing(*Args, **KwArgs):
+    """
+    Log replacement used when logging is turned off
+    """
+    return (None)
 
-    :param Message: Message to write
+def LogSetup():
     """
-    global LogFile
-
-    if (LogFile is None):
-        if platform.system() == "Linux": # for Linux using the X Server
-            LogFile = open("/tmp/trolley.log", "a", buffering=1)
-        elif platform.system() == "Windows": # for Windows
-            if (os.environ["TEMP"] != None):
-                LogFile = open(os.path.join(os.environ["TEMP"], "trolley.log"), "a", buffering=1)
-            else:
-                print("ERROR: No 'TEMP' environment variable")
-                sys.exit(99)
-        elif platform.system() == "Darwin": # for MacOS
-            LogFile = open("/tmp/trolley.log", "a", buffering=1)
+    Send the log to the log file for this platform.  The file is
+    not opened until the first message is written.
+    """
+    global Log
+    # No log wanted (headless runs).  Log becomes a function that
+    # does nothing so the callers don't even go through logging.
+    if (os.environ.get("TROLLEY_NOLOG")):
+        Logger.disabled = True
+        Log = LogNothing
+        return
+
+    if SYSTEM == "Linux": # for Linux using the X Server
+        LogName = "/tmp/trolley.log"
+    elif SYSTEM == "Windows": # for Windows
+        if (os.environ.get("TEMP") != None):
+            LogName = os.path.join(os.environ["TEMP"], "trolley.log")
         else:
-            print("ERROR: Unknown platform: %s" % platform.system())
+            print("ERROR: No 'TEMP' environment variable")
             sys.exit(99)
+    elif SYSTEM == "Darwin": # for MacOS
+        LogName = "/tmp/trolley.log"
+    else:
+        print("ERROR: Unknown platform: %s" % SYSTEM)
+        sys.exit(99)
+
+    FileHandler = logging.FileHandler(LogName, mode="a", delay=True)
+    FileHandler.setFormatter(LogFormatter(
+        "%(asctime)s:%(filename)s:%(lineno)d(%(funcName)s) %(message)s"))
 
-    FrameList = inspect.getouterframes(inspect.currentframe())
-    LogFile.write("%s:%s:%d(%s) %s\n" % (datetime.datetime.now(), 
-        pathlib.Path(FrameList[1].filename).name, FrameList[1].lineno, FrameList[1].function,
-        Message))
+    # Hold the lines in memory and write them in blocks.  LogFlush 
+    # (and logging at exit) writes out the rest.
+    Handler = logging.handlers.MemoryHandler(LOG_BUFFER_LINES, 
+        flushLevel=logging.WARNING, target=FileHandler)
+    Logger.addHandler(Handler)
+    Logger.propagate = False
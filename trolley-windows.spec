@@ -2,7 +2,7 @@
 
 
 a = Analysis(
-    ['brake_ui.py', 'controller.py', 'main.py', 'mode_window.py', 'sim_ui4.py', 'sound.py', 'state.py', 'video_player.py'],
+    ['brake_ui.py', 'controller.py', 'main.py', 'mode_window.py', 'sim_ui4.py', 'sound.py', 'state.py', 'video_player.py', 'pixmap_cache.py', 'modes.py'],
     pathex=[],
     binaries=[
 	('C:\\Program Files\\VideoLAN\\VLC\\', 'VLC'),
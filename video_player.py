@@ -1,8 +1,40 @@
 import os
 import platform
+import shutil
 import subprocess
 import sys
 
+def find_player_command():
+    """
+    Work out, once, how to launch a video player on this operating system.
+
+    Returns:
+        list: Command to run with the video path appended, or None if
+              the operating system opens the file itself (Windows) or
+              no player could be found
+    """
+    if operating_system == "Darwin":  # macOS
+        # Use QuickTime Player if it is installed, otherwise let
+        # 'open' pick the default application for the file
+        for app_dir in ('/System/Applications', '/Applications'):
+            if os.path.isdir(os.path.join(app_dir, 'QuickTime Player.app')):
+                return ['open', '-a', 'QuickTime Player']
+        return ['open']
+
+    if operating_system == "Linux":
+        # Try common Linux video players in order of preference
+        # (xdg-open is the generic file opener fallback)
+        for player in ('vlc', 'mpv', 'mplayer', 'xdg-open'):
+            player_path = shutil.which(player)
+            if player_path is not None:
+                return [player_path]
+
+    return None
+
+# Detect the operating system and the player once, not on every video
+operating_system = platform.system()
+player_command = find_player_command()
+
 def play_video(video_path):
     """
     Play a video file using the default or available video player based on the operating system.
@@ -18,41 +50,18 @@ def play_video(video_path):
         print(f"Error: Video file '{video_path}' not found.")
         return False
     
-    # Detect the operating system
-    operating_system = platform.system()
-    
     try:
         if operating_system == "Windows":
             # On Windows, use the default associated program
             os.startfile(video_path)
         
-        elif operating_system == "Darwin":  # macOS
-            # Try to use QuickTime Player first, fall back to 'open' command
-            try:
-                subprocess.Popen(['open', '-a', 'QuickTime Player', video_path])
-            except:
-                subprocess.Popen(['open', video_path])
-        
-        elif operating_system == "Linux":
-            # Try common Linux video players in order of preference
-            linux_players = [
-                ['vlc', video_path],
-                ['mpv', video_path],
-                ['mplayer', video_path],
-                ['xdg-open', video_path]  # Generic file opener as fallback
-            ]
-            
-            for player in linux_players:
-                try:
-                    subprocess.Popen(player)
-                    break  # Stop trying if a player was found
-                except FileNotFoundError:
-                    continue
-            else:
+        elif operating_system in ("Darwin", "Linux"):
+            if player_command is None:
                 # If no player was found
                 print("Error: No suitable video player found on this Linux system.")
                 print("Please install one of: vlc, mpv, mplayer, or set a default application with xdg-mime.")
                 return False
+            subprocess.Popen(player_command + [video_path])
         
         else:
             print(f"Error: Unsupported operating system: {operating_system}")